@@ -1,23 +1,30 @@
 import streamlit as st
+import pandas as pd
 from modules import (
     data_loader, preview, eda, duplicates, utils, nulls, outliers, type_converter, undo_reset
 )
+from modules.snapshot_store import SnapshotStore
 
 
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)  # shallow copies of the original stay safe to edit
 
 st.set_page_config(page_title="Cleaner", layout="wide", page_icon="🧹")
 st.title("🧼 Cleaner - Your Data Cleaning Assistant")
-st.markdown("A powerful app to clean, analyze, and transform your CSV datasets.")
+st.markdown("A powerful app to clean, analyze, and transform your CSV, Parquet, Feather and Arrow datasets.")
 
 # Initialize snapshots
 if 'snapshots' not in st.session_state:
-    st.session_state.snapshots = []
+    st.session_state.snapshots = SnapshotStore()
 
 # Upload or load sample file
-uploaded = st.file_uploader("📄 Upload CSV file", type=["csv"])
+uploaded = st.file_uploader("📄 Upload a data file", type=["csv", "parquet", "pq", "feather", "arrow", "ipc"])
 if uploaded:
     st.session_state.file = uploaded
 
+na_text = st.text_input("🚫 Treat these values as missing (comma separated)", ", ".join(data_loader.NA_SENTINELS))
+na_values = [v.strip() for v in na_text.split(",") if v.strip()]
+
 with st.expander("📂 Use Sample Dataset"):
     sample_files = {
         "Books": "https://raw.githubusercontent.com/aravindmarri10/data-cleaning-assistant/main/sample_data/books.csv",
@@ -33,7 +40,18 @@ with st.expander("📂 Use Sample Dataset"):
 
 # Load and display tabs if file is available
 if "file" in st.session_state:
-    df, original = data_loader.load_data(st.session_state.file)
+    columns = None
+    if data_loader.file_format(st.session_state.file) != 'csv':
+        all_columns = data_loader.get_file_columns(st.session_state.file)
+        picked = st.multiselect("🧩 Columns to load", all_columns, default=all_columns)
+        if picked and len(picked) < len(all_columns):
+            columns = picked
+    df, original = data_loader.load_data(st.session_state.file, na_values, columns)
+
+    if not st.session_state.na_report.empty:
+        with st.expander("🧾 Missing cells found while parsing"):
+            report = st.session_state.na_report.rename_axis('Column').reset_index(name='Missing Cells')
+            st.dataframe(report, use_container_width=True)
 
     tab = st.sidebar.radio(
         "📌 Select Operation",
@@ -47,9 +65,11 @@ if "file" in st.session_state:
         eda.eda(df)
 
     elif tab == "Duplicate Handling":
-        task = st.sidebar.radio("Select Task", ["Remove Duplicates", "Drop Columns"], key="dup_task")
+        task = st.sidebar.radio("Select Task", ["Remove Duplicates", "Near Duplicates", "Drop Columns"], key="dup_task")
         if task == "Remove Duplicates":
             duplicates.remove_duplicates()
+        elif task == "Near Duplicates":
+            duplicates.remove_near_duplicates()
         else:
             duplicates.drop_columns()
 
@@ -69,4 +89,5 @@ if "file" in st.session_state:
         undo_reset.reset_data(original)
 
     st.markdown("---")
-    utils.download_data(df)
+    utils.download_data(utils.get_dataset().df)  # the tab above may have replaced df
+    utils.download_recipe()
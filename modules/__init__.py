@@ -1,6 +1,17 @@
 # modules/__init__.py
-from .data_loader import load_data
-from .preview import preview_data
-from .duplicates import remove_duplicates
-from .utils import download_data
+# The Streamlit helpers are imported on first use so that headless code
+# (modules.core, modules.cli) can run without importing Streamlit.
+import importlib
 
+_EXPORTS = {
+    'load_data': 'data_loader',
+    'preview_data': 'preview',
+    'remove_duplicates': 'duplicates',
+    'download_data': 'utils',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
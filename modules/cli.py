@@ -0,0 +1,245 @@
+"""Batch cleaning from the command line, one file per worker process.
+
+    python -m modules.cli data/*.csv --out-dir cleaned --dedupe --drop-null-rows \
+        --fill-numeric median --fill-categorical mode --outliers cap
+
+    # replay a recipe recorded in the app, streaming CSV to CSV chunk by chunk
+    python -m modules.cli big.csv --recipe cleaning_recipe.json
+
+    # the same options on a CSV larger than memory; medians and outlier
+    # bounds come from quantile sketches built in extra streaming passes
+    python -m modules.cli big.csv --streaming --drop-null-rows --outliers drop
+
+    # summary of the cleaned numeric columns, per file and for all files together
+    python -m modules.cli part-*.csv --streaming --dedupe --summary --sketch-error 0.005
+"""
+import argparse
+import os
+import sys
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from . import core, recipe
+from .export import EXPORT_FORMATS, write_export
+from .readers import NA_SENTINELS, file_format, read_file
+from .sketches import DEFAULT_K, FrameSketch, k_for_error, rank_error
+
+FORMAT_NAMES = {"csv": "CSV", "parquet": "Parquet", "feather": "Feather", "arrow": "Arrow IPC"}
+
+
+#===== One file ======
+def clean_frame(df, options):
+    """Run the operations selected in ``options`` in a fixed order."""
+    if options["drop_columns"]:
+        df = core.drop_columns(df, [c for c in options["drop_columns"] if c in df.columns])
+    if options["drop_null_columns"] is not None:
+        df = core.drop_null_columns(df, options["drop_null_columns"])
+    if options["dedupe"]:
+        df = core.drop_duplicates(df)
+    if options["drop_null_rows"]:
+        df = core.drop_null_rows(df)
+    if options["fill_numeric"]:
+        fill = _fill_method(options["fill_numeric"])
+        df = core.fill_nulls(df, core.resolve_fills(df, {c: fill for c in core.numeric_columns(df)}))
+    if options["fill_categorical"]:
+        fill = options["fill_categorical"]
+        df = core.fill_nulls(df, core.resolve_fills(df, {c: fill for c in core.categorical_columns(df)}))
+    if options["outliers"]:
+        columns = options["outlier_columns"] or core.numeric_columns(df)
+        bounds = core.outlier_bounds(df, [c for c in columns if c in df.columns], options["outlier_method"])
+        df = core.drop_outliers(df, bounds) if options["outliers"] == "drop" else core.cap_outliers(df, bounds)
+    for column, new_type in options["convert"]:
+        if column in df.columns:
+            df = core.convert_type(df, column, new_type)
+    if options["optimize_memory"]:
+        df = core.convert_dtypes(df, core.plan_dtypes(df))
+    return df
+
+
+def streaming_steps(path, options):
+    """The operations in ``options`` as recipe steps that replay chunk by chunk.
+
+    Statistics (medians, outlier bounds) are taken from a sketch pass over
+    the file with the steps before them applied, so each pass sees the
+    same data the in-memory pipeline would.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    na_values, k = options["na_values"], options["sketch_k"]
+    steps = []
+    if options["drop_columns"]:
+        steps.append(recipe.make_step('drop_columns', columns=[c for c in options["drop_columns"] if c in header]))
+    if options["dedupe"]:
+        steps.append(recipe.make_step('drop_duplicates'))
+    if options["drop_null_rows"]:
+        steps.append(recipe.make_step('drop_null_rows'))
+    if options["fill_numeric"] or options["fill_categorical"]:
+        sketch = recipe.sketch_csv(steps, path, na_values, k)
+        values = {}
+        if options["fill_numeric"] == "median":
+            values.update({col: s.quantile(0.5) for col, s in sketch.columns.items() if s.n})
+        elif options["fill_numeric"]:
+            values.update(dict.fromkeys(sketch.columns, float(options["fill_numeric"])))
+        if options["fill_categorical"]:
+            dropped = set(options["drop_columns"])
+            values.update({c: options["fill_categorical"] for c in header
+                           if c not in sketch.columns and c not in dropped})
+        steps.append(recipe.make_step('fill_nulls', values=values))
+    if options["outliers"]:
+        sketch = recipe.sketch_csv(steps, path, na_values, k)
+        columns = [c for c in options["outlier_columns"] or sketch.columns if c in sketch.columns]
+        bounds = sketch.outlier_bounds(columns, options["outlier_method"])
+        steps.append(recipe.make_step(f'{options["outliers"]}_outliers', bounds=bounds))
+    steps += [recipe.make_step('convert_type', column=c, new_type=t) for c, t in options["convert"] if c in header]
+    return steps
+
+
+def _fill_method(value):
+    if value == "median":
+        return value
+    return float(value)  # a numeric constant
+
+
+def _output_path(path, options):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    ext = EXPORT_FORMATS[FORMAT_NAMES[options["format"]]][0]
+    return os.path.join(options["out_dir"], f"{stem}.{ext}")
+
+
+def clean_file(path, options):
+    """Worker entry point: read, clean and write one file. Returns a summary dict.
+
+    With the ``summary`` option, its ``"sketch"`` is a FrameSketch of the
+    cleaned numeric columns, to describe or merge with other files'.
+    """
+    out_path = _output_path(path, options)
+    sketch = FrameSketch(options["sketch_k"]) if options["summary"] else None
+    steps = options["recipe"]
+    if steps is None and options["streaming"]:
+        if file_format(path) != "csv" or options["format"] != "csv":
+            raise ValueError("--streaming reads and writes CSV only")
+        steps = streaming_steps(path, options)
+    if steps is not None and options["format"] == "csv" and file_format(path) == "csv":
+        # out-of-core: never holds more than one chunk of the input
+        with open(out_path, "wb") as out:
+            rows_in, rows_out = recipe.replay_csv(steps, path, out, options["na_values"], sketch)
+        return {"file": path, "rows": (rows_in, rows_out), "columns": None, "output": out_path, "sketch": sketch}
+
+    with open(path, "rb") as stream:
+        df, _ = read_file(stream, file_format(path), options["na_values"])
+    rows_in, cols_in = df.shape
+    df = recipe.apply_recipe(df, steps) if steps is not None else clean_frame(df, options)
+    with open(out_path, "wb") as out:
+        write_export(df, out, FORMAT_NAMES[options["format"]])
+    if sketch is not None:
+        sketch.update(df)
+    return {"file": path, "rows": (rows_in, len(df)), "columns": (cols_in, df.shape[1]), "output": out_path,
+            "sketch": sketch}
+
+
+#===== Command line ======
+def _convert_arg(text):
+    column, _, new_type = text.rpartition(":")
+    if not column or new_type not in core.CONVERT_TYPES:
+        raise argparse.ArgumentTypeError(f"expected COLUMN:TYPE with TYPE in {core.CONVERT_TYPES}")
+    return column, new_type
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m modules.cli", description="Clean many data files in parallel.")
+    parser.add_argument("files", nargs="+", help="CSV, Parquet, Feather or Arrow IPC files")
+    parser.add_argument("--out-dir", default="cleaned", help="where cleaned files are written")
+    parser.add_argument("--format", choices=list(FORMAT_NAMES), default="csv", help="output format")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--recipe", help="replay a recipe JSON recorded in the app instead of the options below")
+    parser.add_argument("--streaming", action="store_true",
+                        help="clean CSVs larger than memory chunk by chunk, with approximate medians and outlier bounds")
+    parser.add_argument("--sketch-k", type=int, default=DEFAULT_K,
+                        help="quantile sketch size for --streaming and --summary; larger is more accurate "
+                             f"(default %(default)s, ~{rank_error(DEFAULT_K) * 100:.1f}%% rank error)")
+    parser.add_argument("--sketch-error", type=float, metavar="FRACTION",
+                        help="target quantile rank error instead of --sketch-k, e.g. 0.005 for 0.5%%")
+    parser.add_argument("--summary", action="store_true",
+                        help="print count, mean, std and approximate quartiles of the cleaned numeric columns, "
+                             "per file and for all files together")
+    parser.add_argument("--na-values", default=",".join(NA_SENTINELS), help="comma separated missing-value markers (CSV only)")
+    parser.add_argument("--drop-columns", default="", help="comma separated columns to drop")
+    parser.add_argument("--drop-null-columns", type=float, metavar="PCT", help="drop columns with more than PCT%% nulls")
+    parser.add_argument("--dedupe", action="store_true", help="drop exact duplicate rows")
+    parser.add_argument("--drop-null-rows", action="store_true", help="drop rows with any null")
+    parser.add_argument("--fill-numeric", metavar="median|VALUE", help="fill numeric nulls")
+    parser.add_argument("--fill-categorical", metavar="mode|VALUE", help="fill categorical nulls")
+    parser.add_argument("--outliers", choices=["drop", "cap"], help="outlier handling")
+    parser.add_argument("--outlier-method", choices=list(core.OUTLIER_METHODS), default="iqr", help="how outlier bounds are set")
+    parser.add_argument("--outlier-columns", default="", help="comma separated columns (default: all numeric)")
+    parser.add_argument("--convert", type=_convert_arg, action="append", default=[], metavar="COLUMN:TYPE")
+    parser.add_argument("--optimize-memory", action="store_true",
+                        help="store each column in the smallest lossless dtype (columnar output keeps it)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.fill_numeric and args.fill_numeric != "median":
+        try:
+            float(args.fill_numeric)
+        except ValueError:
+            build_parser().error("--fill-numeric takes 'median' or a number")
+    if args.streaming and (args.drop_null_columns is not None or args.fill_categorical == "mode"
+                           or args.outlier_method == "mad" or args.optimize_memory):
+        build_parser().error("--streaming can't do --drop-null-columns, categorical mode fills, MAD outliers "
+                             "or --optimize-memory")
+    if args.sketch_error is not None and not 0 < args.sketch_error < 1:
+        build_parser().error("--sketch-error takes a fraction between 0 and 1")
+    steps = None
+    if args.recipe:
+        with open(args.recipe, encoding="utf-8") as f:
+            steps = recipe.load_recipe(f.read())
+    os.makedirs(args.out_dir, exist_ok=True)
+    options = {
+        "recipe": steps,
+        "streaming": args.streaming,
+        "sketch_k": args.sketch_k if args.sketch_error is None else k_for_error(args.sketch_error),
+        "summary": args.summary,
+        "out_dir": args.out_dir,
+        "format": args.format,
+        "na_values": [v.strip() for v in args.na_values.split(",") if v.strip()],
+        "drop_columns": [c.strip() for c in args.drop_columns.split(",") if c.strip()],
+        "drop_null_columns": args.drop_null_columns,
+        "dedupe": args.dedupe,
+        "drop_null_rows": args.drop_null_rows,
+        "fill_numeric": args.fill_numeric,
+        "fill_categorical": args.fill_categorical,
+        "outliers": args.outliers,
+        "outlier_method": args.outlier_method,
+        "outlier_columns": [c.strip() for c in args.outlier_columns.split(",") if c.strip()],
+        "convert": args.convert,
+        "optimize_memory": args.optimize_memory,
+    }
+
+    failed, sketches = 0, []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(args.files)))) as pool:
+        futures = {pool.submit(clean_file, path, options): path for path in args.files}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {futures[future]}: {e}", file=sys.stderr)
+                continue
+            rows_in, rows_out = result["rows"]
+            columns = ", {}→{} columns".format(*result["columns"]) if result["columns"] else ""
+            print(f"✅ {result['file']}: {rows_in}→{rows_out} rows{columns} -> {result['output']}")
+            if result["sketch"] is not None:
+                print(result["sketch"].describe().to_string(), end="\n\n")
+                sketches.append(result["sketch"])
+    if len(sketches) > 1:
+        # per-file sketches merge into the sketch of all the cleaned data
+        total = FrameSketch(options["sketch_k"])
+        for sketch in sketches:
+            total.merge(sketch)
+        print(f"📊 All {len(sketches)} files:")
+        print(total.describe().to_string())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
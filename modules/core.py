@@ -0,0 +1,326 @@
+"""Cleaning operations on plain DataFrames, shared by the Streamlit tabs and the CLI.
+
+Nothing here imports Streamlit or touches session state. Every operation
+returns a new frame and leaves its input unchanged.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+CONVERT_TYPES = ["int", "float", "str", "datetime"]
+
+
+#===== Column groups ======
+def numeric_columns(df):
+    return df.select_dtypes(include='number').columns.tolist()
+
+
+def categorical_columns(df):
+    """Text-like columns, covering object, pandas/Arrow strings and categoricals."""
+    return df.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
+
+
+#===== Duplicates and columns ======
+def duplicate_rows(df, subset=None):
+    """Boolean mask of rows that repeat an earlier row."""
+    return df.duplicated(subset=subset)
+
+
+def drop_duplicates(df, subset=None):
+    return df.drop_duplicates(subset=subset, ignore_index=True)
+
+
+def drop_columns(df, columns):
+    return df.drop(columns=list(columns))
+
+
+#===== Nulls ======
+def row_null_counts(df):
+    """Number of missing values in each row."""
+    return df.isna().sum(axis=1).to_numpy(dtype='int64')
+
+
+def rows_over_threshold(counts, n_cols, threshold=None):
+    """Rows to drop given their null counts: any missing value, or more than ``threshold`` percent."""
+    if threshold is None:
+        return counts > 0
+    return counts * 100 > threshold * n_cols
+
+
+def null_rows(df, threshold=None):
+    """Boolean mask of rows with a missing value (or more than ``threshold`` percent missing)."""
+    return rows_over_threshold(row_null_counts(df), df.shape[1], threshold)
+
+
+def drop_null_rows(df, threshold=None):
+    return df[~null_rows(df, threshold)]
+
+
+def null_columns(df, threshold):
+    """Columns whose share of missing values is above ``threshold`` percent."""
+    null_pct = df.isna().mean() * 100
+    return null_pct[null_pct > threshold].index.tolist()
+
+
+def drop_null_columns(df, threshold):
+    return df.drop(columns=null_columns(df, threshold))
+
+
+def resolve_fills(df, methods):
+    """Turn {column: 'median' | 'mode' | constant} into concrete fill values.
+
+    All medians come from one ``median()`` call and all modes from one
+    ``mode()`` call; all-missing columns get no value.
+    """
+    medians = [col for col, method in methods.items() if method == 'median']
+    modes = [col for col, method in methods.items() if method == 'mode']
+    found = {col: method for col, method in methods.items() if method not in ('median', 'mode')}
+    if medians:
+        found.update(df[medians].median().dropna().to_dict())
+    if modes:
+        top = df[modes].mode()
+        if len(top):
+            found.update(top.iloc[0].dropna().to_dict())
+    return {col: found[col] for col in methods if col in found}
+
+
+def fill_nulls(df, values):
+    """Fill each column with its value in one ``fillna``. Integer columns become float for fractional fills."""
+    casts = {col: 'float64' for col, value in values.items()  # nullable ints can't hold a .5 median
+             if pd.api.types.is_integer_dtype(df[col]) and isinstance(value, (int, float, np.number)) and value != int(value)}
+    if casts:
+        df = df.astype(casts)
+    # a categorical column only accepts values that are among its categories
+    grown = {col: df[col].cat.add_categories([value]) for col, value in values.items()
+             if isinstance(df[col].dtype, pd.CategoricalDtype) and value not in df[col].cat.categories}
+    if grown:
+        df = df.assign(**grown)
+    return df.fillna(values)
+
+
+#===== Outliers ======
+# method -> default multiplier k for its spread
+OUTLIER_METHODS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5}
+MAD_SCALE = 1.4826  # makes the MAD comparable to a standard deviation for normal data
+
+
+def outlier_bounds(df, columns, method='iqr', k=None):
+    """{column: (low, high)} for every column, each statistic computed in one call over all of them.
+
+    iqr: Q1 - k*IQR .. Q3 + k*IQR; zscore: mean -/+ k*std; mad: median -/+ k*1.4826*MAD.
+    """
+    k = OUTLIER_METHODS[method] if k is None else k
+    data = df[list(columns)]
+    if method == 'iqr':
+        q = data.quantile([0.25, 0.75])
+        low, high = q.loc[0.25], q.loc[0.75]
+        spread = high - low
+    elif method == 'zscore':
+        low = high = data.mean()
+        spread = data.std()
+    elif method == 'mad':
+        low = high = data.median()
+        spread = (data - low).abs().median() * MAD_SCALE
+    else:
+        raise ValueError(f"Unknown outlier method: {method}")
+    # nullable dtypes give pd.NA for empty columns; NaN bounds flag nothing
+    low = (low - k * spread).astype('float64')
+    high = (high + k * spread).astype('float64')
+    return {col: (float(low[col]), float(high[col])) for col in data.columns}
+
+
+def outlier_mask(df, bounds):
+    """(rows x columns) boolean array, True where a value is outside its bounds. Missing values are not outliers."""
+    cols = list(bounds)
+    values = df[cols].to_numpy(dtype='float64', na_value=np.nan)
+    low = np.array([bounds[c][0] for c in cols])
+    high = np.array([bounds[c][1] for c in cols])
+    with np.errstate(invalid='ignore'):
+        return (values < low) | (values > high)
+
+
+def outlier_rows(df, bounds):
+    """Boolean array of rows with an outlier in any of the bounded columns."""
+    return outlier_mask(df, bounds).any(axis=1)
+
+
+def drop_outliers(df, bounds):
+    return df[~outlier_rows(df, bounds)]
+
+
+def cap_outliers(df, bounds):
+    cols = list(bounds)
+    low = pd.Series({c: bounds[c][0] for c in cols})
+    high = pd.Series({c: bounds[c][1] for c in cols})
+    # bounds are floats; the cast also turns pd.NA into NaN
+    capped = df[cols].astype('float64').clip(lower=low, upper=high, axis=1)
+    return df.assign(**{col: capped[col] for col in cols})
+
+
+#===== Type conversion ======
+UNIQUE_PARSE_SHARE = 0.5  # parse distinct values only when they are at most this share of rows
+
+
+@lru_cache(maxsize=1024)
+def datetime_format(sample):
+    """strftime format guessed from one value, or None; cached so repeat conversions skip the guess."""
+    return guess_datetime_format(sample)
+
+
+def _parse(values, new_type):
+    if new_type == "int":
+        numbers = pd.Series(pd.to_numeric(values, errors='coerce'))
+        if pd.api.types.is_integer_dtype(numbers):
+            return numbers.astype("Int64")
+        numbers = numbers.astype('float64')
+        # exact, so every value kept casts cleanly: 2.5, 2.000000001 and values past int64 become missing
+        whole = (numbers % 1 == 0) & numbers.abs().lt(2.0 ** 63)
+        return numbers.where(whole).astype("Int64")
+    if new_type == "float":
+        return pd.Series(pd.to_numeric(values, errors='coerce')).astype(float)
+    if new_type == "str":
+        return pd.Series(values).astype(str)
+    if new_type == "datetime":
+        sample = next((v for v in values if isinstance(v, str)), None)
+        fmt = datetime_format(sample) if sample else None
+        return pd.Series(pd.to_datetime(values, errors='coerce', format=fmt))
+    raise ValueError(f"Unknown type: {new_type}")
+
+
+def convert_series(series, new_type):
+    """Convert to one of CONVERT_TYPES; values that fail become missing.
+
+    Columns with few distinct values are parsed once per distinct value
+    and mapped back, which is much faster for dates and numbers stored as text.
+    """
+    if new_type not in CONVERT_TYPES:
+        raise ValueError(f"Unknown type: {new_type}")
+    if new_type == "str" or (new_type in ("int", "float") and pd.api.types.is_numeric_dtype(series)):
+        return _parse(series, new_type).set_axis(series.index).rename(series.name)
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > UNIQUE_PARSE_SHARE * len(series):
+        parsed = _parse(series.to_numpy(dtype=object), new_type)
+    else:
+        # a trailing missing value, so the -1 code of missing rows maps to it
+        parsed = _parse(np.append(np.asarray(uniques, dtype=object), None), new_type).take(codes)
+    return parsed.set_axis(series.index).rename(series.name)
+
+
+def convert_type(df, column, new_type):
+    df = df.copy(deep=False)
+    df[column] = convert_series(df[column], new_type)
+    return df
+
+
+def convert_columns(df, types, workers=None):
+    """Convert {column: new_type} at once, columns in parallel threads, assigned in one pass."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        converted = dict(zip(types, pool.map(lambda item: convert_series(df[item[0]], item[1]), types.items())))
+    return df.assign(**converted)
+
+
+#===== Memory optimization ======
+CATEGORY_MAX_SHARE = 0.5  # strings become categorical when at most this share of values is distinct
+BOOL_WORDS = [{'yes': True, 'no': False}, {'y': True, 'n': False},
+              {'true': True, 'false': False}, {'t': True, 'f': False}]
+
+
+def _smallest_int(series):
+    """Narrowest integer dtype (same signedness and nullability) that holds every value, if narrower."""
+    unsigned = pd.api.types.is_unsigned_integer_dtype(series)
+    nullable = isinstance(series.dtype, pd.api.extensions.ExtensionDtype)
+    low, high = series.min(), series.max()
+    for bits in (8, 16, 32):
+        if bits >= series.dtype.itemsize * 8:
+            return None
+        info = np.iinfo(f"{'uint' if unsigned else 'int'}{bits}")
+        if info.min <= low and high <= info.max:
+            return f"{'UInt' if unsigned else 'Int'}{bits}" if nullable else f"{'uint' if unsigned else 'int'}{bits}"
+    return None
+
+
+def _bool_words(series):
+    """The yes/no style mapping that covers every value of a text column, if there is one."""
+    words = set(series.dropna().str.lower().unique()) if series.notna().any() else set()
+    for mapping in BOOL_WORDS:
+        if words and words <= set(mapping):
+            return mapping
+    return None
+
+
+def plan_dtypes(df):
+    """{column: smaller dtype} for columns that can be stored in less memory without losing values."""
+    plan = {}
+    text_cols = set(categorical_columns(df))
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or not series.notna().any():
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            target = _smallest_int(series)
+        elif pd.api.types.is_float_dtype(series) and series.dtype != 'float32':
+            as32 = series.astype('float32').astype(series.dtype)
+            target = 'float32' if ((as32 == series) | series.isna()).all() else None
+        elif col in text_cols and not isinstance(series.dtype, pd.CategoricalDtype):
+            text = series.astype('string')
+            if _bool_words(text):
+                target = 'boolean'
+            elif series.nunique() <= CATEGORY_MAX_SHARE * len(series):
+                target = 'category'
+            elif series.dtype == object:
+                target = 'string[pyarrow]'
+            else:
+                target = None
+        else:
+            target = None
+        if target is not None and target != str(series.dtype):
+            plan[col] = target
+    return plan
+
+
+def bool_words(df, dtypes):
+    """{column: yes/no mapping} for the columns a plan turns into booleans, to record with the plan."""
+    return {col: _bool_words(df[col].astype('string')) for col, dtype in dtypes.items() if dtype == 'boolean'}
+
+
+def _fits(series, dtype):
+    """Whether casting series to an integer or float32 dtype keeps every value."""
+    values = series.dropna()
+    if not len(values):
+        return True
+    if dtype == 'float32':
+        return bool((values.astype('float32').astype('float64') == values.astype('float64')).all())
+    if not pd.api.types.is_integer_dtype(values) and not (values.astype('float64') % 1 == 0).all():
+        return False
+    info = np.iinfo(str(dtype).lower())
+    return bool(info.min <= values.min() and values.max() <= info.max)
+
+
+def convert_dtypes(df, dtypes, bool_words=None):
+    """Apply a plan from plan_dtypes, all columns in one assign.
+
+    The plan may come from a sample (a recorded recipe replayed on the full
+    file), so a column keeps its dtype where the cast would change values:
+    integers out of range, float32 rounding, or words outside its yes/no
+    mapping (``bool_words``, see bool_words()).
+    """
+    bool_words = bool_words or {}
+    converted = {}
+    for col, dtype in dtypes.items():
+        series = df[col]
+        if dtype == 'boolean':
+            text = series.astype('string').str.lower()
+            mapping = bool_words.get(col) or _bool_words(text)
+            if mapping is None and text.notna().any():
+                continue
+            mapped = text.map(mapping or {})
+            if (mapped.isna() & text.notna()).any():
+                continue
+            converted[col] = mapped.astype('boolean')
+        elif (dtype == 'float32' or dtype.lower().startswith(('int', 'uint'))) and not _fits(series, dtype):
+            continue
+        else:
+            converted[col] = series.astype(dtype)
+    return df.assign(**converted)
@@ -0,0 +1,97 @@
+"""Correlation matrices that survive edits: only columns whose data changed are recomputed.
+
+Callers pass a stamp per column (the dataset's column keys, see
+modules.dataset) that changes whenever the column's data does. A cached
+matrix remembers the stamps it was built from; on the next request only
+the rows/columns of changed or new columns are recomputed (one
+``corrwith`` each). Missing values are skipped pair by pair. Spearman is
+Pearson on ranks, and ranks are cached per column stamp too; pairs
+where either column has missing values are re-ranked on their common
+rows, so the result matches ``DataFrame.corr('spearman')``.
+"""
+import numpy as np
+import pandas as pd
+
+METHODS = ['pearson', 'spearman']
+
+
+#===== Cache ======
+class CorrelationCache:
+    """Correlation matrices per method, with the column stamps each was built from."""
+
+    def __init__(self):
+        self._matrices = {}  # method -> (stamps, matrix)
+        self._ranks = {}  # stamp -> (ranked values, has missing values)
+
+    def matrix(self, df, columns, stamps, method='pearson'):
+        """Correlations of ``columns``; ``stamps`` has one stamp per column, in the same order."""
+        stamps = dict(zip(columns, stamps))
+        data = self._source(df, columns, stamps, method)
+        old_stamps, old = self._matrices.get(method, ({}, None))
+        stale = [col for col in columns if old_stamps.get(col) != stamps[col]]
+        if old is None or len(stale) > len(columns) // 2:
+            corr = data.corr()
+            stale = columns
+        else:
+            corr = old.reindex(index=columns, columns=columns)
+            for col in stale:
+                values = data.corrwith(data[col])
+                corr.loc[col, :] = values
+                corr.loc[:, col] = values
+        if method == 'spearman':
+            self._rerank_gaps(df, corr, columns, stale, stamps)
+        self._matrices[method] = (stamps, corr)
+        return corr
+
+    def _rerank_gaps(self, df, corr, columns, stale, stamps):
+        """Spearman for recomputed pairs with missing values, ranked on the rows both columns have."""
+        gappy = {col for col in columns if self._ranks[stamps[col]][1]}
+        done = set()
+        for a in stale:
+            for b in columns:
+                if a == b or (b, a) in done or not (a in gappy or b in gappy):
+                    continue
+                done.add((a, b))
+                both = df[[a, b]].dropna()
+                value = both[a].rank().corr(both[b].rank()) if len(both) > 1 else np.nan
+                corr.loc[a, b] = corr.loc[b, a] = value
+
+    def _source(self, df, columns, stamps, method):
+        if method == 'pearson':
+            return df[columns]
+        # ranks of columns that didn't change are reused; ranks of older stamps are let go
+        self._ranks = {stamps[col]: self._ranks.get(stamps[col]) for col in columns}
+        for col in columns:
+            if self._ranks[stamps[col]] is None:
+                self._ranks[stamps[col]] = (df[col].rank().to_numpy(dtype='float64', na_value=np.nan),
+                                            bool(df[col].isna().any()))
+        return pd.DataFrame({col: self._ranks[stamps[col]][0] for col in columns})
+
+
+#===== Views ======
+def top_pairs(corr, k=10):
+    """The k column pairs with the largest absolute correlation."""
+    upper = np.triu(np.ones(corr.shape, dtype=bool), k=1)
+    pairs = corr.where(upper).stack().dropna().rename('Correlation').rename_axis(['Column A', 'Column B']).reset_index()
+    return pairs.reindex(pairs['Correlation'].abs().sort_values(ascending=False).index[:k]).reset_index(drop=True)
+
+
+def cluster_order(corr):
+    """Columns in the leaf order of average-linkage clustering on 1 - |r|, so related columns sit together."""
+    dist = 1 - np.abs(np.nan_to_num(corr.to_numpy(), nan=0.0))
+    np.fill_diagonal(dist, np.inf)
+    members = [[i] for i in range(len(dist))]
+    sizes = np.ones(len(dist))
+    active = np.ones(len(dist), dtype=bool)
+    for _ in range(len(dist) - 1):
+        masked = np.where(active[:, None] & active[None, :], dist, np.inf)
+        a, b = np.unravel_index(np.argmin(masked), masked.shape)
+        # merge b into a; average linkage (Lance-Williams update)
+        merged = (sizes[a] * dist[a] + sizes[b] * dist[b]) / (sizes[a] + sizes[b])
+        dist[a, :], dist[:, a] = merged, merged
+        dist[a, a] = np.inf
+        sizes[a] += sizes[b]
+        members[a] += members[b]
+        active[b] = False
+    order = members[int(np.flatnonzero(active)[0])] if len(dist) else []
+    return list(corr.columns[order])
@@ -1,25 +1,104 @@
-import pandas as pd
-import numpy as np
+import hashlib
+import io
+import os
+import urllib.request
 import streamlit as st
+from .dataset import Dataset
+from .dataset_cache import DatasetCache, content_hash, CACHE_MAX_MB, CACHE_DIR
+from .readers import NA_SENTINELS, file_format, read_file, read_schema
 
-def load_data(file):
+
+#===== Shared cache ======
+@st.cache_resource
+def get_dataset_cache():
+    """One cache per server process, shared by every browser session."""
+    return DatasetCache(CACHE_MAX_MB << 20, CACHE_DIR)
+
+
+def _file_token(file):
+    """Cheap identity of the current source, used to skip hashing on reruns."""
+    if not isinstance(file, str):
+        return file.file_id  # new id on every upload, even with the same name
+    if os.path.exists(file):
+        stat = os.stat(file)
+        return (file, stat.st_mtime_ns, stat.st_size)
+    return file
+
+
+def _read_bytes(file):
+    """Return a seekable binary stream for hashing and parsing."""
+    if isinstance(file, str):
+        if file.startswith(("http://", "https://")):
+            with urllib.request.urlopen(file) as resp:
+                return io.BytesIO(resp.read())
+        return open(file, "rb")
+    return file
+
+
+def get_file_columns(file):
+    """Column names of a columnar upload, remembered per source so reruns don't reread them."""
+    token = _file_token(file)
+    if st.session_state.get("schema_token") != token:
+        stream = _read_bytes(file)
+        try:
+            st.session_state.schema_columns = read_schema(stream, file_format(file))
+        finally:
+            if stream is not file:
+                stream.close()
+        st.session_state.schema_token = token
+    return st.session_state.schema_columns
+
+
+def _confirm_reload(previous, token):
+    """Whether to re-read for ``token``: always for a new source, after a Reload click if edits would be lost."""
+    dataset = st.session_state.get("dataset")
+    if previous is None or previous[0] != token[0] or dataset is None or not dataset.version:
+        return True
+    changed = "the missing-value markers" if previous[1] != token[1] else "the columns to load"
+    notice = st.empty()
+    with notice.container():
+        st.warning(f"⚠️ Changing {changed} re-reads the file, which discards your edits and undo history.")
+        reload = st.button("🔄 Reload with these settings")
+    if reload:
+        notice.empty()
+    return reload
+
+
+def load_data(file, na_values=NA_SENTINELS, columns=None):
     try:
-        # Handle both UploadedFile and string (sample URL)
-        if isinstance(file, str):
-            file_id = file  # use URL string directly
-        else:
-            file_id = file.name  # use uploaded file name
-
-        # Load only if new file
-        if "file_name" not in st.session_state or st.session_state.file_name != file_id:
-            df = pd.read_csv(file)
-            df = df.replace(['-', 'n/a', 'N/A', 'missing'], np.nan)
-            st.session_state.df = df
-            st.session_state.raw_data = df.copy()
-            st.session_state.file_name = file_id
+        fmt = file_format(file)
+        if fmt != 'csv':
+            na_values = ()
+        columns = list(columns) if columns is not None else None
+        # changed markers or a different column selection mean a re-read
+        file_token = (_file_token(file), tuple(na_values), tuple(columns or ()))
+
+        # Load only if the source changed since the last run (edited data is kept until a reload is confirmed)
+        previous = st.session_state.get("file_token")
+        if previous != file_token and _confirm_reload(previous, file_token):
+            stream = _read_bytes(file)
+            try:
+                options = hashlib.blake2b(repr((fmt, tuple(na_values), columns)).encode(), digest_size=4).hexdigest()
+                key = f"{content_hash(stream)}-{options}"
+                cache = get_dataset_cache()
+                cached = cache.get(key)
+                if cached is None:
+                    bar = st.progress(0.0, text=f"Reading {fmt}...")
+                    cached = read_file(stream, fmt, na_values, columns, progress=lambda p: bar.progress(p, text=f"Parsing CSV... {p:.0%}"))
+                    bar.empty()
+                    cache.put(key, *cached)
+            finally:
+                if stream is not file:
+                    stream.close()
+            df, missing = cached
+            st.session_state.raw_data = df  # shared with other sessions, never modified
+            st.session_state.dataset = Dataset(df.copy(deep=False))  # copy-on-write keeps raw_data intact
+            st.session_state.na_report = missing[missing > 0]
+            st.session_state.file_token = file_token
+            st.session_state.snapshots.clear()  # history belongs to the previous dataset
 
     except Exception as e:
         st.error(f"❌ Failed to load file: {e}")
         raise e
 
-    return st.session_state.df, st.session_state.raw_data
+    return st.session_state.dataset.df, st.session_state.raw_data
@@ -0,0 +1,55 @@
+"""The working frame with version stamps, so caches can tell what an edit changed.
+
+``version`` goes up on every edit. Each column also carries the version
+of the last edit that touched it, and ``rows_version`` that of the last
+edit that changed which rows there are. ``column_key(col)`` combines them:
+a result computed from some columns stays valid for as long as their
+keys are the same.
+"""
+import itertools
+
+_uids = itertools.count()
+
+
+class Dataset:
+    """A DataFrame plus its version, per-column stamps and the last edit."""
+
+    def __init__(self, df):
+        self.uid = next(_uids)  # keys of two loaded files never collide
+        self.df = df
+        self.version = 0
+        self.rows_version = 0
+        self.column_versions = {col: 0 for col in df.columns}
+        self.last_change = None  # ('rows', dropped_mask) | ('columns', edited) | None: what made `version`
+
+    @property
+    def key(self):
+        """Changes with every edit; for caches of the whole frame."""
+        return (self.uid, self.version)
+
+    def column_key(self, col):
+        """Changes when the column's values or the set of rows change; unique to the column."""
+        return (self.uid, col, self.rows_version, self.column_versions[col])
+
+    def columns_key(self, columns):
+        return tuple(self.column_key(col) for col in columns)
+
+    def update(self, df, columns=None, rows=None):
+        """Replace the frame after an edit and bump the stamps it invalidates.
+
+        Pass ``columns`` (replaced, dropped or added) or ``rows`` (boolean
+        mask of dropped rows, or True when dropped rows came back on undo),
+        as for modules.undo_reset.save_snapshot. With neither, everything
+        counts as changed.
+        """
+        self.version += 1
+        if columns is not None:
+            changed = set(columns) | (set(df.columns) - set(self.column_versions))
+            self.last_change = ('columns', list(columns))
+        else:
+            self.rows_version = self.version
+            changed = set(df.columns) if rows is None else set()  # a row drop leaves the columns' own stamps alone
+            self.last_change = None if rows is None or rows is True else ('rows', rows)
+        self.column_versions = {col: self.version if col in changed else self.column_versions.get(col, self.version)
+                                for col in df.columns}
+        self.df = df
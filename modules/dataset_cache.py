@@ -0,0 +1,84 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, blake2b is slower but always there
+    xxhash = None
+
+HASH_CHUNK = 8 << 20  # bytes hashed per read
+CACHE_MAX_MB = int(os.environ.get("CLEANER_CACHE_MB", 1024))
+CACHE_DIR = os.environ.get("CLEANER_CACHE_DIR")  # unset = memory only
+
+
+#===== Content hash ======
+def content_hash(stream):
+    """Hash a binary stream chunk by chunk and rewind it."""
+    h = xxhash.xxh3_128() if xxhash else hashlib.blake2b(digest_size=16)
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK), b""):
+        h.update(chunk)
+    stream.seek(0)
+    return h.hexdigest()
+
+
+#===== LRU dataset cache ======
+class DatasetCache:
+    """Parsed frames keyed by content hash, bounded by memory, optionally persisted as Parquet.
+
+    Frames handed out are shared between sessions and must not be mutated.
+    """
+
+    def __init__(self, max_bytes, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._items = OrderedDict()  # key -> (df, missing, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.parquet")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                df, missing, _ = self._items[key]
+                return df, missing
+        if self.disk_dir and os.path.exists(self._path(key)):
+            df = pd.read_parquet(self._path(key))
+            missing = df.isna().sum()
+            self._remember(key, df, missing)
+            return df, missing
+        return None
+
+    def put(self, key, df, missing):
+        self._remember(key, df, missing)
+        if self.disk_dir and not os.path.exists(self._path(key)):
+            # a temp file per writer: sessions parsing the same file at once don't write over each other
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, prefix=f"{key}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                df.to_parquet(tmp, index=False)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                os.remove(tmp)
+                raise
+
+    def _remember(self, key, df, missing):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[2]
+            self._items[key] = (df, missing, nbytes)
+            self._bytes += nbytes
+            # always keep the newest entry, even if it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, _, size) = self._items.popitem(last=False)
+                self._bytes -= size
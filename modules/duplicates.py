@@ -1,22 +1,120 @@
 import streamlit as st
-from .undo_reset import save_snapshot
+import pandas as pd
+from .undo_reset import apply_edit
+from . import core
+from .recipe import make_step
+from .row_index import RowHashIndex
+from . import near_duplicates
+from .viewer import show_rows
+from .utils import get_dataset
+
+MAX_GROUPS = 1000  # duplicate groups listed at once
+
+
+#===== Cached row-hash index ======
+def get_row_index(df):
+    """RowHashIndex of df, carried over from the cached one: only columns whose stamp changed are re-hashed."""
+    dataset = get_dataset()
+    stamps = {col: dataset.column_key(col) for col in df.columns}
+    cached = st.session_state.get('row_index')
+    if cached is not None and cached[1] == stamps:
+        return cached[2]
+    index = None
+    if cached is not None:
+        version, old_stamps, old = cached
+        change = dataset.last_change
+        if change is not None and change[0] == 'rows' and version == (dataset.uid, dataset.version - 1):
+            index = old.after_row_drop(df, change[1])  # the cached frame is the one these rows were dropped from
+        else:
+            index = old.after_column_edit(df, [col for col in df.columns if old_stamps.get(col) != stamps[col]])
+    st.session_state.row_index = (dataset.key, stamps, index or RowHashIndex(df))
+    return st.session_state.row_index[2]
+
 
 def remove_duplicates():
-    df = st.session_state.df  
+    df = get_dataset().df
     st.subheader("🧭 Duplicate Detection")
-    dup = df.duplicated().sum()
+    keys = st.multiselect("Key columns (empty = whole row)", df.columns.tolist(), key="dup_keys")
+    subset = keys or None
+    index = get_row_index(df)
+    dup_mask = index.duplicated(subset)
+    dup = int(dup_mask.sum())
     if dup > 0:
         st.warning(f"🚨 Found {dup} duplicate rows.")
+        if st.checkbox("🔍 Show duplicate groups"):
+            show_groups(df, index, subset)
         if st.button("🗑️ Drop Duplicates"):
-            save_snapshot(df)
-            df = df.drop_duplicates(ignore_index=True)
-            st.session_state.df = df
+            # the mask that was counted is the one dropped, so undo and the carried index line up
+            apply_edit(df[~dup_mask], rows=dup_mask, step=make_step('drop_duplicates', subset=subset))
             st.success("✅ Duplicate rows removed.")
     else:
         st.info("✨ No duplicates found.")
 
+
+def show_groups(df, index, subset):
+    """One line per group (its first row and copy count); rows of a single group on request."""
+    groups = index.groups(subset)
+    shown = groups.head(MAX_GROUPS)
+    table = df.iloc[shown['First Row']][subset or df.columns].reset_index(drop=True)
+    table.insert(0, 'Copies', shown['Copies'].to_numpy())
+    st.write(f"{len(groups)} duplicate groups" + (f", showing the largest {MAX_GROUPS}." if len(groups) > MAX_GROUPS else "."))
+    st.dataframe(table)
+    group = st.number_input("Inspect group #", min_value=0, max_value=len(shown) - 1, value=0, step=1)
+    show_rows(df, index.members(shown.at[group, 'Key'], subset), key="dup_group_rows")
+
+def get_clusters(df, columns, threshold):
+    """Near-duplicate cluster labels, cached for the dataset version and settings."""
+    key = (get_dataset().columns_key(columns), tuple(columns), threshold)
+    cached = st.session_state.get('near_dup_clusters')
+    if cached is None or cached[0] != key:
+        with st.spinner("Hashing rows..."):
+            clusters = near_duplicates.near_duplicate_clusters(df, columns, threshold)
+        st.session_state.near_dup_clusters = (key, clusters)
+    return st.session_state.near_dup_clusters[1]
+
+
+def remove_near_duplicates():
+    df = get_dataset().df
+    st.subheader("🧬 Near-Duplicate Detection")
+    text_cols = core.categorical_columns(df)
+    if not text_cols:
+        st.info("ℹ️ No text columns to compare.")
+        return
+    cols = st.multiselect("Text columns to compare", text_cols, key="near_dup_cols")
+    threshold = st.slider("Similarity threshold", 0.5, 1.0, 0.8, 0.05, key="near_dup_threshold")
+    st.caption("Rows match when their normalized text (case and spacing ignored) shares about this share of 3-character pieces.")
+    if not cols:
+        st.warning("⚠️ No columns selected.")
+        return
+
+    clusters = get_clusters(df, cols, threshold)
+    extra = near_duplicates.duplicate_positions(clusters)
+    if not extra.any():
+        st.info("✨ No near-duplicates found.")
+        return
+    sizes = pd.Series(clusters).value_counts()
+    sizes = sizes[sizes > 1]
+    st.warning(f"🚨 Found {len(sizes)} clusters with {int(extra.sum())} extra rows.")
+    if st.checkbox("🔍 Show clusters"):
+        shown = sizes.head(MAX_GROUPS)
+        table = df.iloc[shown.index][cols].reset_index(drop=True)
+        table.insert(0, 'Rows', shown.to_numpy())
+        st.dataframe(table)
+        group = st.number_input("Inspect cluster #", min_value=0, max_value=len(shown) - 1, value=0, step=1)
+        show_rows(df, clusters == shown.index[group], key="near_dup_cluster_rows")
+
+    col1, col2 = st.columns(2)
+    params = dict(columns=cols, threshold=threshold)
+    if col1.button("🗑️ Drop Near-Duplicates"):
+        apply_edit(df[~extra], rows=extra, step=make_step('drop_near_duplicates', **params))
+        st.success("✅ Kept the first row of each cluster.")
+    if col2.button("🔗 Merge Clusters"):
+        apply_edit(near_duplicates.merge_clusters(df, clusters), step=make_step('merge_near_duplicates', **params))
+        st.success("✅ Each cluster merged into one row, filling gaps from the other rows.")
+
+
 def drop_columns():
-    df = st.session_state.df  
+    df = get_dataset().df
     st.subheader("🧹 Drop Columns")
     cols = st.multiselect("Select columns to drop", df.columns.tolist())
     if not cols:
@@ -26,7 +124,5 @@ def drop_columns():
             st.dataframe(df[cols].head())
 
         if st.button("🚫 Apply Drop"):
-            save_snapshot(df)
-            df = df.drop(columns=cols)
-            st.session_state.df = df
+            apply_edit(core.drop_columns(df, cols), columns=cols, step=make_step('drop_columns', columns=cols))
             st.success(f"✅ Dropped: {', '.join(cols)}")
\ No newline at end of file
@@ -1,71 +1,149 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 import seaborn as sns
-from .utils import plot_and_download,download_data
+import numpy as np
+from . import plot_stats, correlation
+from .utils import plot_and_download
+from .profiler import get_profile, TOP_VALUES
 
+ANNOTATE_MAX = 20  # heatmaps wider than this lose the per-cell numbers
+LABEL_MAX = 80  # ... and wider than this lose the column labels
+ID_LIKE = 0.9  # share of distinct values above which a column looks like an ID
 
 def eda(df):
     st.subheader("📊 Exploratory Data Analysis")
+    profile = get_profile(df)
     plot = st.sidebar.radio("Choose EDA Plot", ['Histogram', 'Box Plot', 'Bar Plot', 'Category vs. Numeric Bar', 'Heat Map'], key = "eda_plot_choice")
 
+    # each plot is drawn only when it isn't in the figure cache for the current data of its columns
     if plot == 'Histogram':
         st.subheader("📉 Histogram")
-        num_cols = df.select_dtypes(include='number').columns.tolist()
-        col = st.selectbox("Select numeric columns", num_cols)
-        fig, ax = plt.subplots(figsize=(16, 4))
-        sns.histplot(df[col], kde=True, ax=ax, color="steelblue", edgecolor='black')
-        ax.set_title(f"Distribution of {col}", fontsize=14, pad=10) 
-        ax.set_xlabel(col) 
-        ax.set_ylabel("Frequency")
-        ax.grid(True, linestyle='--', alpha=0.5)
-        plot_and_download(fig, f"{col}_hist.png")
-
-            
+        col = st.selectbox("Select numeric columns", profile.num_cols)
+        bins = st.slider("Bins", 10, 200, 50, key="hist_bins")
 
+        def draw():
+            # bin counts and a sampled KDE instead of every row
+            counts, edges = plot_stats.histogram(df[col], bins)
+            x, y = plot_stats.kde_curve(df[col], edges)
+            fig, ax = plt.subplots(figsize=(16, 4))
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color="steelblue", edgecolor='black', alpha=0.75)
+            ax.plot(x, y, color="steelblue")
+            ax.set_title(f"Distribution of {col}", fontsize=14, pad=10)
+            ax.set_xlabel(col)
+            ax.set_ylabel("Frequency")
+            ax.grid(True, linestyle='--', alpha=0.5)
+            return fig
+        plot_and_download(('histogram', col, bins), draw, f"{col}_hist.png", columns=[col])
 
     elif plot == 'Box Plot':
         st.subheader("📦 Box Plot")
-        col = st.selectbox("Select a numeric column", df.select_dtypes(include='number').columns)
-        fig, ax = plt.subplots(figsize=(16, 4))
-        sns.boxplot(x=df[col], ax=ax, palette="Set3")
-        ax.set_title(f"Boxplot of {col}", fontsize=14)
-        ax.set_xlabel(col)
-        file_name=f"{col}_boxplot.png"
-        plot_and_download(fig, file_name )
+        col = st.selectbox("Select a numeric column", profile.num_cols)
+
+        def draw():
+            stats = plot_stats.box_stats(df[col])
+            fig, ax = plt.subplots(figsize=(16, 4))
+            if stats is not None:
+                ax.bxp([stats], orientation='horizontal', widths=0.6, patch_artist=True,
+                       boxprops={'facecolor': sns.color_palette("Set3")[0]})
+            ax.set_yticks([])
+            ax.set_title(f"Boxplot of {col}", fontsize=14)
+            ax.set_xlabel(col)
+            return fig
+        plot_and_download(('box', col), draw, f"{col}_boxplot.png", columns=[col])
 
     elif plot == 'Bar Plot':
         st.subheader("📊 Bar Plot")
-        cat_col = st.selectbox("Select a categorical column", df.select_dtypes(include='object').columns)
-        order = df[cat_col].value_counts().index
-        fig, ax = plt.subplots(figsize=(16, 4))
-        sns.countplot(x=cat_col, data=df, order=order, ax=ax, palette="Set2")
-        ax.set_title(f"Count Plot of {cat_col}", fontsize=14)
-        ax.set_xlabel(cat_col)
-        ax.set_ylabel("Count")
-        plt.xticks(rotation=45)
-        file_name=f"{cat_col}_bar_plot.png"
-        plot_and_download(fig, file_name )
+        cat_col = st.selectbox("Select a categorical column", profile.cat_cols)
+        unique, non_null = profile.stats.at[cat_col, 'Unique'], profile.stats.at[cat_col, 'Non-Null']
+        top_n = st.slider("Bars", 5, TOP_VALUES, 20, key="bar_top_n")
+        if unique > top_n:
+            st.info(f"ℹ️ {unique} distinct values; the smallest are grouped into 'Other'.")
+        if non_null and unique > ID_LIKE * non_null:
+            st.warning("⚠️ Almost every value is distinct (an ID or free text?), so counts are not very informative.")
+
+        def draw():
+            # bars come from the profile's cached value counts, not from the rows
+            counts = plot_stats.top_counts(profile.top_values[cat_col], non_null, unique, top_n)
+            fig, ax = plt.subplots(figsize=(16, 4))
+            ax.bar(counts.index, counts.to_numpy(), color=sns.color_palette("Set2", len(counts)))
+            ax.set_title(f"Count Plot of {cat_col}", fontsize=14)
+            ax.set_xlabel(cat_col)
+            ax.set_ylabel("Count")
+            ax.tick_params(axis='x', labelrotation=45)
+            return fig
+        plot_and_download(('bar', cat_col, top_n), draw, f"{cat_col}_bar_plot.png", columns=[cat_col])
 
-        
-        
     elif plot == 'Category vs. Numeric Bar':
             st.subheader("📊 Category vs. Numeric Bar Plot")
-            cat_col = st.selectbox("Select categorical column", df.select_dtypes(include='object').columns)
-            num_col = st.selectbox("Select numeric column", df.select_dtypes(include='number').columns)
-            order = df.groupby(cat_col)[num_col].mean().sort_values(ascending=False).index
-            fig, ax = plt.subplots(figsize=(16, 4))
-            sns.barplot(x=cat_col, y=num_col, data=df, order=order, ax=ax, palette="Set2")
-            ax.set_title(f"Average {num_col} per {cat_col}", fontsize=14)
-            plt.xticks(rotation=45)
-            file_name=f"{cat_col}_vs_{num_col}_bar.png"
-            plot_and_download(fig, file_name )
-            
+            cat_col = st.selectbox("Select categorical column", profile.cat_cols)
+            num_col = st.selectbox("Select numeric column", profile.num_cols)
+            top_n = st.slider("Bars", 5, TOP_VALUES, 20, key="cat_num_top_n")
+            ci = st.radio("Error bars", ['None', 'Standard error', 'Bootstrap'], horizontal=True, key="cat_num_ci")
+            stats = profile.derived(('group_stats', cat_col, num_col), lambda: plot_stats.group_stats(df, cat_col, num_col),
+                                    columns=[cat_col, num_col])
+            if len(stats) > top_n:
+                st.info(f"ℹ️ {len(stats)} categories; showing the {top_n} with the most rows.")
+
+            def draw():
+                shown = stats.nlargest(top_n, 'count').sort_values('mean', ascending=False)
+                if ci == 'Standard error':
+                    errors = plot_stats.analytic_ci(shown).fillna(0).to_numpy()
+                elif ci == 'Bootstrap':
+                    errors = plot_stats.bootstrap_ci(df, cat_col, num_col, shown.index.tolist())
+                else:
+                    errors = None
+                fig, ax = plt.subplots(figsize=(16, 4))
+                ax.bar(shown.index.astype(str), shown['mean'].to_numpy(), yerr=errors, capsize=3,
+                       color=sns.color_palette("Set2", len(shown)))
+                ax.set_title(f"Average {num_col} per {cat_col}", fontsize=14)
+                ax.set_xlabel(cat_col)
+                ax.set_ylabel(num_col)
+                ax.tick_params(axis='x', labelrotation=45)
+                return fig
+            plot_and_download(('cat_vs_num', cat_col, num_col, top_n, ci), draw, f"{cat_col}_vs_{num_col}_bar.png",
+                              columns=[cat_col, num_col])
 
     elif plot == 'Heat Map':
         st.subheader("🌡️ Heatmap of Correlations")
-        num_df = df.select_dtypes(include='number')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.heatmap(num_df.corr(), annot=True, fmt=".2f", cmap="coolwarm", ax=ax, linewidths=0.5)
-        ax.set_title("Correlation Matrix", fontsize=14)
-        file_name= "correlation_heatmap.png"
-        plot_and_download(fig, file_name )
\ No newline at end of file
+        if len(profile.num_cols) < 2:
+            st.info("ℹ️ Need at least two numeric columns.")
+            return
+        method = st.radio("Method", correlation.METHODS, format_func=str.title, horizontal=True, key="corr_method")
+        clustered = st.checkbox("🧩 Group correlated columns together", key="corr_clustered")
+        stamps = [profile.column_keys[col] for col in profile.num_cols]
+        corr = profile.derived(('corr', method), lambda: get_correlations().matrix(df, profile.num_cols, stamps, method),
+                               columns=profile.num_cols)
+        if clustered:
+            order = profile.derived(('corr_order', method), lambda: correlation.cluster_order(corr), columns=profile.num_cols)
+            corr = corr.loc[order, order]
+
+        def draw():
+            n = len(corr)
+            size = min(max(10, n * 0.25), 30)
+            fig, ax = plt.subplots(figsize=(size, size * 0.6))
+            if n <= ANNOTATE_MAX:
+                sns.heatmap(corr, annot=True, fmt=".2f", cmap="coolwarm", ax=ax, linewidths=0.5, vmin=-1, vmax=1)
+            else:
+                # one raster image, no per-cell text or patches
+                image = ax.imshow(corr.to_numpy(), cmap="coolwarm", vmin=-1, vmax=1, interpolation='nearest', aspect='auto')
+                fig.colorbar(image, ax=ax)
+                if n <= LABEL_MAX:
+                    ax.set_xticks(range(n), corr.columns, rotation=90, fontsize=6)
+                    ax.set_yticks(range(n), corr.index, fontsize=6)
+                else:
+                    ax.set_xticks([])
+                    ax.set_yticks([])
+            ax.set_title(f"Correlation Matrix ({method.title()})", fontsize=14)
+            return fig
+        plot_and_download(('heatmap', method, clustered), draw, "correlation_heatmap.png", columns=profile.num_cols)
+
+        k = st.slider("Strongest pairs", 5, 50, 10, key="corr_top_k")
+        st.dataframe(correlation.top_pairs(corr, k))
+
+
+#===== Correlation cache ======
+def get_correlations():
+    """Session-wide CorrelationCache; it outlives dataset versions so columns with unchanged stamps are reused."""
+    if 'correlations' not in st.session_state:
+        st.session_state.correlations = correlation.CorrelationCache()
+    return st.session_state.correlations
@@ -0,0 +1,86 @@
+import io
+import gzip
+import zipfile
+
+CSV_CHUNK_ROWS = 100_000  # rows serialized per to_csv call
+COMPRESSIONS = {
+    "None": ("", "text/csv"),
+    "gzip": (".gz", "application/gzip"),
+    "zip": (".zip", "application/zip"),
+}
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Feather": ("feather", "application/octet-stream"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+#===== CSV writer ======
+def write_csv(df, out, chunk_rows=CSV_CHUNK_ROWS, header=True):
+    """Write df to a binary stream a slice at a time, so the full CSV never exists as one str."""
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    for start in range(0, max(len(df), 1), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(text, header=header and start == 0, index=False)
+    text.flush()
+    text.detach()  # leave `out` open for the caller
+
+
+def export_csv(df, out, compression="None"):
+    if compression == "gzip":
+        with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6) as gz:
+            write_csv(df, gz)
+    elif compression == "zip":
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+            with zf.open("cleaned_data.csv", "w") as entry:
+                write_csv(df, entry)
+    else:
+        write_csv(df, out)
+
+
+#===== Any format ======
+def write_export(df, out, fmt, compression="None"):
+    """Write df to a binary stream in one of EXPORT_FORMATS. Columnar formats keep dtypes on re-import."""
+    if fmt == "CSV":
+        export_csv(df, out, compression)
+    elif fmt == "Parquet":
+        df.to_parquet(out, index=False)
+    elif fmt == "Feather":
+        df.reset_index(drop=True).to_feather(out)
+    else:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_file(out, table.schema) as writer:
+            writer.write_table(table)
+
+
+def export_bytes(df, fmt, compression="None"):
+    buf = io.BytesIO()
+    write_export(df, buf, fmt, compression)
+    return buf.getvalue()
+
+
+def export_name(fmt, compression="None"):
+    """File name and mime type for a download in ``fmt``."""
+    ext, mime = EXPORT_FORMATS[fmt]
+    if fmt == "CSV" and compression != "None":
+        suffix, mime = COMPRESSIONS[compression]
+        return ("cleaned_data.zip" if compression == "zip" else f"cleaned_data.csv{suffix}"), mime
+    return f"cleaned_data.{ext}", mime
+
+
+#===== Per-version cache ======
+class ExportCache:
+    """Serialized bytes for the current dataset version; older versions are dropped."""
+
+    def __init__(self):
+        self.version = None
+        self._items = {}
+
+    def get_or_build(self, df, version, fmt, compression="None"):
+        if version != self.version:
+            self.version, self._items = version, {}
+        key = (fmt, compression)
+        if key not in self._items:
+            self._items[key] = export_bytes(df, fmt, compression)
+        return self._items[key]
@@ -0,0 +1,89 @@
+"""Imputers beyond one value per column: median per group and k-nearest neighbours.
+
+Both work on numeric columns and return a new frame, like the
+operations in modules.core.
+"""
+import numpy as np
+import pandas as pd
+
+KNN_REFERENCE = 20_000  # complete rows that neighbours are searched among (sampled above this)
+KNN_CHUNK = 256  # incomplete rows imputed per block; bounds the distance matrix to KNN_CHUNK x KNN_REFERENCE
+
+
+def _as_column(df, col, values):
+    """Float values as a Series for col; integer columns stay integer when every value is whole."""
+    series = pd.Series(values, index=df.index, name=col)
+    if pd.api.types.is_integer_dtype(df[col]):
+        present = values[~np.isnan(values)]
+        if np.array_equal(present, np.round(present)):
+            return series.astype('Int64' if len(present) < len(values) else df[col].dtype)
+    return series
+
+
+#===== Median per group ======
+def group_medians(df, by, columns):
+    """Parameters for fill_by_group: every column's median per group (one groupby) and overall."""
+    columns = list(columns)
+    medians = df.groupby(by, observed=True)[columns].median().astype('float64')
+    return {
+        'by': by,
+        'groups': medians.index.tolist(),
+        'medians': {col: medians[col].tolist() for col in columns},
+        'fallback': df[columns].median().astype('float64').to_dict(),  # for rows whose group is missing or all-null
+    }
+
+
+def fill_by_group(df, by, groups, medians, fallback):
+    """Fill each column's nulls with the median of the row's group (see group_medians)."""
+    filled = df.copy(deep=False)
+    for col, values in medians.items():
+        per_row = df[by].map(pd.Series(values, index=groups, dtype='float64')).to_numpy(dtype='float64', na_value=np.nan)
+        overall = fallback.get(col)
+        per_row = np.where(np.isnan(per_row), np.nan if overall is None else overall, per_row)
+        data = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        data = np.where(np.isnan(data), per_row, data)
+        filled[col] = _as_column(df, col, data)
+    return filled
+
+
+#===== k-nearest neighbours ======
+def knn_impute(df, columns, k=5, reference=KNN_REFERENCE, seed=0):
+    """Fill nulls in ``columns`` with the mean of the k most similar complete rows.
+
+    Distance is Euclidean on standardized columns, over the columns the
+    incomplete row has (scaled up for the ones it lacks). Rows are
+    imputed in blocks of KNN_CHUNK, so memory stays bounded.
+    """
+    columns = list(columns)
+    data = df[columns].to_numpy(dtype='float64', na_value=np.nan, copy=True)
+    missing = np.isnan(data)
+    rows = np.flatnonzero(missing.any(axis=1))
+    complete = np.flatnonzero(~missing.any(axis=1))
+    if not len(rows) or not len(complete):
+        return df
+    if len(complete) > reference:
+        complete = np.sort(np.random.default_rng(seed).choice(complete, reference, replace=False))
+    k = min(k, len(complete))
+
+    mean, std = np.nanmean(data, axis=0), np.nanstd(data, axis=0)
+    std[~(std > 0)] = 1.0
+    scaled = (data - mean) / std
+    ref, ref_raw = scaled[complete], data[complete]
+    ref_sq = ref ** 2
+
+    for start in range(0, len(rows), KNN_CHUNK):
+        idx = rows[start:start + KNN_CHUNK]
+        present = ~missing[idx]
+        query = np.where(present, scaled[idx], 0.0)
+        # squared distance over each row's present columns: |q|^2 - 2 q.r + |r|^2 (masked)
+        dist = (query ** 2).sum(axis=1)[:, None] - 2 * query @ ref.T + present.astype('float64') @ ref_sq.T
+        dist *= len(columns) / np.maximum(present.sum(axis=1), 1)[:, None]
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        block = data[idx]
+        block[~present] = ref_raw[nearest].mean(axis=1)[~present]
+        data[idx] = block
+
+    filled = df.copy(deep=False)
+    for j in np.flatnonzero(missing.any(axis=0)):
+        filled[columns[j]] = _as_column(df, columns[j], data[:, j])
+    return filled
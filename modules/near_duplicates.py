@@ -0,0 +1,133 @@
+"""Near-duplicate rows from MinHash signatures and locality-sensitive hashing.
+
+The selected text columns of each row are normalized (case, whitespace),
+cut into character shingles and summarized by a MinHash signature whose
+agreement with another row's estimates their Jaccard similarity. LSH
+buckets signatures by bands so only rows sharing a band are compared,
+which keeps the work roughly linear in the number of rows.
+"""
+import re
+import numpy as np
+import pandas as pd
+
+SHINGLE = 3  # characters per shingle
+NUM_PERM = 128  # MinHash signature length
+BLOCK = 1 << 16  # shingles hashed per block, bounds memory to BLOCK * NUM_PERM values
+_SPACE = re.compile(r"\s+")
+_MULT = np.uint64(0x100000001B3)
+
+
+#===== Signatures ======
+def row_text(df, columns):
+    """Selected columns joined per row, lower-cased with whitespace collapsed."""
+    text = df[columns[0]].astype('string').fillna('')
+    for col in columns[1:]:
+        text = text + ' | ' + df[col].astype('string').fillna('')
+    return text.str.lower().str.replace(_SPACE, ' ', regex=True).str.strip()
+
+
+def _shingles(text):
+    return [text[i:i + SHINGLE] for i in range(max(len(text) - SHINGLE + 1, 1))]
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=1):
+    """(rows x num_perm) uint64 MinHash signatures of each text's character shingles."""
+    shingles = [_shingles(t) for t in texts]
+    lengths = np.fromiter(map(len, shingles), dtype='int64', count=len(shingles))
+    flat = np.fromiter((s for row in shingles for s in row), dtype=object, count=int(lengths.sum()))
+    hashes = pd.util.hash_array(flat)
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, num_perm, dtype='uint64') | np.uint64(1)  # odd multipliers
+    b = rng.integers(0, 2 ** 63, num_perm, dtype='uint64')
+
+    signatures = np.empty((len(lengths), num_perm), dtype='uint64')
+    starts = np.concatenate([[0], np.cumsum(lengths)])
+    row = 0
+    while row < len(lengths):
+        # a block of whole rows with at most BLOCK shingles (or a single long row)
+        end = max(int(np.searchsorted(starts, starts[row] + BLOCK, side='right')) - 1, row + 1)
+        block = hashes[starts[row]:starts[end]]
+        with np.errstate(over='ignore'):
+            permuted = block[:, None] * a + b
+        signatures[row:end] = np.minimum.reduceat(permuted, starts[row:end] - starts[row], axis=0)
+        row = end
+    return signatures
+
+
+#===== LSH ======
+def lsh_bands(num_perm, threshold):
+    """(bands, rows per band) whose similarity cut-off (1/bands)**(1/rows) is closest to threshold."""
+    options = [(num_perm // r, r) for r in range(1, num_perm + 1) if num_perm % r == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+def _band_keys(band):
+    keys = np.zeros(len(band), dtype='uint64')
+    with np.errstate(over='ignore'):
+        for column in band.T:
+            keys = (keys * _MULT) ^ column
+    return keys
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def near_duplicate_clusters(df, columns, threshold=0.8, num_perm=NUM_PERM, seed=1):
+    """Cluster label per row: the position of the first row of its cluster (its own position if unique).
+
+    Rows sharing an LSH bucket are linked when their signatures agree on
+    at least ``threshold`` of the positions (estimated Jaccard similarity).
+    """
+    text = row_text(df, list(columns))
+    blank = (text.str.strip(' |') == '').to_numpy()  # rows with no text are never near-duplicates
+    signatures = minhash_signatures(text.tolist(), num_perm, seed)
+    bands, rows = lsh_bands(num_perm, threshold)
+    candidates = [np.empty((0, 2), dtype='int64')]
+    for band in range(bands):
+        keys = _band_keys(signatures[:, band * rows:(band + 1) * rows])
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        # every row in a bucket is paired with the bucket's first row
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        first = np.repeat(order[starts], np.diff(np.r_[starts, len(order)]))
+        paired = first != order
+        candidates.append(np.column_stack([first[paired], order[paired]]))
+    pairs = np.unique(np.concatenate(candidates), axis=0)
+    pairs = pairs[~(blank[pairs[:, 0]] | blank[pairs[:, 1]])]
+
+    similar = [(signatures[block[:, 0]] == signatures[block[:, 1]]).mean(axis=1) >= threshold
+               for block in np.array_split(pairs, max(1, len(pairs) // 4096))]
+    parent = np.arange(len(df))
+    for i, j in pairs[np.concatenate(similar)].tolist():
+        ri, rj = _find(parent, i), _find(parent, j)
+        parent[max(ri, rj)] = min(ri, rj)
+    while True:  # point every row straight at its root
+        root = parent[parent]
+        if (root == parent).all():
+            return parent
+        parent = root
+
+
+#===== Operations ======
+def duplicate_positions(clusters):
+    """Boolean array of rows that belong to a cluster started by an earlier row."""
+    return clusters != np.arange(len(clusters))
+
+
+def drop_near_duplicates(df, columns, threshold=0.8):
+    """Keep the first row of every near-duplicate cluster."""
+    return df[~duplicate_positions(near_duplicate_clusters(df, columns, threshold))]
+
+
+def merge_clusters(df, clusters):
+    """One row per cluster, each column taking the first non-missing value among the cluster's rows."""
+    merged = df.groupby(clusters, sort=True).first()
+    return merged.set_axis(df.index[merged.index])
+
+
+def merge_near_duplicates(df, columns, threshold=0.8):
+    return merge_clusters(df, near_duplicate_clusters(df, columns, threshold))
@@ -1,33 +1,46 @@
 import streamlit as st
-from .utils import get_null_summary, numeric_fill_ui, apply_numeric_fill, cat_fill_ui, apply_cat_fill
-from .undo_reset import save_snapshot
+from .utils import numeric_fill_ui, cat_fill_ui, apply_fills, get_dataset
+from . import core, imputation
+from .recipe import make_step
+from .undo_reset import apply_edit
+from .profiler import get_profile
+from .viewer import show_rows
+
+IMPUTE_STRATEGIES = ['Per column', 'Median by group', 'Nearest neighbours (KNN)']
 
 def null_handling():
     st.subheader("🔍 Null Value Handler")
-    df = st.session_state.df  # ✅ always start here
+    df = get_dataset().df  # ✅ always start here
 
     sub = st.sidebar.radio("Select Null Handling Method", 
         ['Null Summary', 'Drop Rows with Nulls', 'Drop Columns with Nulls',
          'Fill Numeric Nulls', 'Fill Categorical Nulls'], key="null_handling_method")
 
-    null_per = get_null_summary(df)
+    profile = get_profile(df)
+    null_per = profile.null_summary()
 
     if sub == 'Null Summary':
         if null_per.empty:
             st.success("🎉 No missing values!")
         else:
             st.dataframe(null_per)
+            st.caption(f"{int((profile.row_nulls > 0).sum())} of {profile.n_rows} rows have at least one missing value.")
 
     elif sub == 'Drop Rows with Nulls':
-        dropped_df = df.dropna()
-        loss = df.shape[0] - dropped_df.shape[0]
-        percent_loss = round((loss / df.shape[0]) * 100, 2)
+        # counted from the profile's per-row null counts; nothing is dropped until confirmed
+        mode = st.radio("Drop rows with", ['Any null', 'Nulls above threshold'], horizontal=True, key="null_rows_mode")
+        threshold = None
+        if mode == 'Nulls above threshold':
+            threshold = st.slider("Row null threshold (%)", 0, 100, 50, key="null_rows_threshold")
+        null_rows = profile.derived(('null_rows', threshold),
+                                    lambda: core.rows_over_threshold(profile.row_nulls, profile.n_cols, threshold))
+        loss = int(null_rows.sum())
+        percent_loss = round((loss / df.shape[0]) * 100, 2) if len(df) else 0.0
         st.warning(f"⚠️ {loss} rows ({percent_loss}%) will be removed.")
         if st.checkbox("Preview rows to be dropped"):
-            st.dataframe(df[~df.index.isin(dropped_df.index)])
-        if st.button("🧹 Drop Null Rows"):
-            save_snapshot(df)
-            st.session_state.df = dropped_df
+            show_rows(df, null_rows, key="null_rows_preview")
+        if loss and st.button("🧹 Drop Null Rows"):
+            apply_edit(df[~null_rows], rows=null_rows, step=make_step('drop_null_rows', threshold=threshold))
             st.success("✅ Null rows removed.")
 
     elif sub == 'Drop Columns with Nulls':
@@ -38,34 +51,59 @@ def null_handling():
             if st.checkbox("Preview columns to be dropped"):
                 st.dataframe(df[to_drop].head())
             if st.button("🗑️ Drop Columns"):
-                save_snapshot(df)
-                st.session_state.df = df.drop(columns=to_drop)
+                apply_edit(core.drop_columns(df, to_drop), columns=to_drop, step=make_step('drop_columns', columns=to_drop))
                 st.success("✅ Columns dropped.")
         else:
             st.info("No columns exceed threshold.")
 
     elif sub == 'Fill Numeric Nulls':
-        numeric_cols = df.select_dtypes(include='number').columns
+        numeric_cols = profile.num_cols
         numeric_nulls = null_per[null_per['Column'].isin(numeric_cols)]
 
         if numeric_nulls.empty:
             st.info("✅ No numeric nulls.")
         else:
-            numeric_fill_ui(numeric_nulls, df)
-            if st.button("💾 Apply Fills"):
-                save_snapshot(df)
-                st.session_state.df = apply_numeric_fill(numeric_nulls, df)
-                st.success("✅ Numeric nulls filled.")
+            strategy = st.radio("Fill strategy", IMPUTE_STRATEGIES, horizontal=True, key="numeric_fill_strategy")
+            if strategy == 'Per column':
+                methods = numeric_fill_ui(numeric_nulls, df)
+                if st.button("💾 Apply Fills"):
+                    filled, values = apply_fills(methods, df)
+                    apply_edit(filled, columns=numeric_nulls['Column'], step=make_step('fill_nulls', values=values))
+                    st.success("✅ Numeric nulls filled.")
+            else:
+                impute_numeric(df, profile, numeric_nulls['Column'].tolist(), strategy)
 
     elif sub == 'Fill Categorical Nulls':
-        cat_cols = df.select_dtypes(include='object').columns
+        cat_cols = profile.cat_cols
         cat_nulls = null_per[null_per['Column'].isin(cat_cols)]
 
         if cat_nulls.empty:
             st.info("✅ No categorical nulls.")
         else:
-            cat_fill_ui(cat_nulls, df)
+            methods = cat_fill_ui(cat_nulls, df)
             if st.button("💾 Apply Fills"):
-                save_snapshot(df)
-                st.session_state.df = apply_cat_fill(cat_nulls, df)
+                filled, values = apply_fills(methods, df)
+                apply_edit(filled, columns=cat_nulls['Column'], step=make_step('fill_nulls', values=values))
                 st.success("✅ Categorical nulls filled.")
+
+
+#===== Numeric imputation ======
+def impute_numeric(df, profile, null_cols, strategy):
+    """Fill every numeric null column at once: with its median per group, or from the k nearest rows."""
+    if strategy == 'Median by group':
+        if not profile.cat_cols:
+            st.info("ℹ️ No categorical column to group by.")
+            return
+        by = st.selectbox("Group by", profile.cat_cols, key="impute_group_by")
+        st.caption(f"Each null gets the median of its {by} group (overall median where the group has none).")
+        if st.button("💾 Apply Fills"):
+            params = imputation.group_medians(df, by, null_cols)
+            apply_edit(imputation.fill_by_group(df, **params), columns=null_cols, step=make_step('fill_by_group', **params))
+            st.success(f"✅ {len(null_cols)} numeric columns filled with medians per {by}.")
+    else:
+        k = st.slider("Neighbours (k)", 1, 20, 5, key="impute_knn_k")
+        st.caption("Each null gets the mean of the k most similar rows, compared on all numeric columns.")
+        if st.button("💾 Apply Fills"):
+            apply_edit(imputation.knn_impute(df, profile.num_cols, k), columns=null_cols,
+                       step=make_step('knn_impute', columns=profile.num_cols, k=k))
+            st.success(f"✅ {len(null_cols)} numeric columns filled from nearest neighbours.")
@@ -1,69 +1,61 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from .utils import get_iqr_bounds
-from .undo_reset import save_snapshot
+from .profiler import get_profile
+from .undo_reset import apply_edit
+from . import core
+from .recipe import make_step
+from .viewer import show_rows
+
+METHOD_LABELS = {'IQR': 'iqr', 'Z-score': 'zscore', 'MAD': 'mad'}
+
 
 def outlier_detection(df):
     st.subheader("🚨 Outlier Handler")
     mode = st.sidebar.radio("Outlier Mode", ['Show Outliers', 'Drop Outliers', 'Cap Outliers'],  key = "outlier_mode")
+    method = METHOD_LABELS[st.sidebar.selectbox("Outlier Method", list(METHOD_LABELS), key="outlier_method")]
+    k = st.sidebar.number_input("Threshold (k)", min_value=0.1, value=core.OUTLIER_METHODS[method],
+                                step=0.5, key=f"outlier_k_{method}")
 
-    num_cols = df.select_dtypes(include='number').columns
-    summary = []
-
-    for col in num_cols:
-        low, high = get_iqr_bounds(df[col])
-        count = df[(df[col] < low) | (df[col] > high)].shape[0]
-        summary.append({'Column': col, 'Outlier Count': count})
-
-    outlier_df = pd.DataFrame(summary)
+    profile = get_profile(df)
+    # bounds and the outlier mask for every numeric column, recomputed only when one of them changes
+    bounds = profile.derived(('outlier_bounds', method, k),
+                             lambda: core.outlier_bounds(df, profile.num_cols, method, k), columns=profile.num_cols)
+    mask = profile.derived(('outlier_mask', method, k), lambda: core.outlier_mask(df, bounds), columns=profile.num_cols)
+    outlier_df = pd.DataFrame({'Column': list(bounds), 'Outlier Count': mask.sum(axis=0)})
 
     if mode == 'Show Outliers':
         if outlier_df['Outlier Count'].sum() == 0:
             st.info("🎉 No outliers found.")
         else:
             st.dataframe(outlier_df)
+        return
 
-    elif mode == 'Drop Outliers':
-        if outlier_df['Outlier Count'].sum() == 0:
-            st.info("✅ No outliers to drop.")
-        else:
-            st.warning("⚠️ Dropping outliers may reduce data size significantly and somtimes form new outliers.")
-            cols = st.multiselect("Select columns", outlier_df[outlier_df['Outlier Count'] > 0]['Column'])
-            if cols:
-                temp = df.copy()
-                before = temp.shape[0]
-                for col in cols:
-                    low, high = get_iqr_bounds(df[col])
-                    temp = temp[(temp[col] >= low) & (temp[col] <= high)]
-                after = temp.shape[0]
-                dropped = before - after
-                pct = round((dropped / before) * 100, 2)
-                st.info(f"Rows dropped: {dropped} ({pct}%)")
-                if st.checkbox("🔍 Preview dropped rows"):
-                    st.dataframe(df[~df.index.isin(temp.index)])
-                if st.button("Confirm Drop"):
-                    save_snapshot(df)
-                    st.session_state.df = temp
-                    st.success("✅ Outliers removed.")
+    if outlier_df['Outlier Count'].sum() == 0:
+        st.info("✅ No outliers to drop." if mode == 'Drop Outliers' else "✅ No outliers to cap.")
+        return
+    if mode == 'Drop Outliers':
+        st.warning("⚠️ Dropping outliers may reduce data size significantly and somtimes form new outliers.")
+    cols = st.multiselect("Select columns", outlier_df[outlier_df['Outlier Count'] > 0]['Column'])
+    if not cols:
+        return
+    selected = {col: bounds[col] for col in cols}
+    positions = [list(bounds).index(col) for col in cols]
+    affected = mask[:, positions].any(axis=1)  # rows dropped or capped
 
-    elif mode == 'Cap Outliers':
-        if outlier_df['Outlier Count'].sum() == 0:
-            st.info("✅ No outliers to cap.")
-        else:
-            cols = st.multiselect("Select columns", outlier_df[outlier_df['Outlier Count'] > 0]['Column'])
-            if cols:
-                temp = df.copy()
-                for col in cols:
-                    low, high = get_iqr_bounds(df[col])
-                    temp[col] = np.where(temp[col] < low, low, temp[col])
-                    temp[col] = np.where(temp[col] > high, high, temp[col])
-                if st.checkbox("🔍 Show capped rows"):
-                    diff = df[cols] != temp[cols]
-                    affected = df[diff.any(axis=1)]
-                    st.write(f"{affected.shape[0]} rows capped.")
-                    st.dataframe(affected)
-                if st.button("Confirm Capping"):
-                    save_snapshot(df)
-                    st.session_state.df = temp
-                    st.success("✅ Outliers capped.")
\ No newline at end of file
+    if mode == 'Drop Outliers':
+        dropped = int(affected.sum())
+        pct = round((dropped / len(df)) * 100, 2)
+        st.info(f"Rows dropped: {dropped} ({pct}%)")
+        if st.checkbox("🔍 Preview dropped rows"):
+            show_rows(df, affected, key="outlier_drop_preview")
+        if st.button("Confirm Drop"):
+            apply_edit(df[~affected], rows=affected, step=make_step('drop_outliers', bounds=selected))
+            st.success("✅ Outliers removed.")
+
+    else:
+        if st.checkbox("🔍 Show capped rows"):
+            st.write(f"{int(affected.sum())} rows capped.")
+            show_rows(df, affected, key="outlier_cap_preview")
+        if st.button("Confirm Capping"):
+            apply_edit(core.cap_outliers(df, selected), columns=cols, step=make_step('cap_outliers', bounds=selected))
+            st.success("✅ Outliers capped.")
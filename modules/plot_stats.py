@@ -0,0 +1,98 @@
+"""Small aggregates that EDA plots are drawn from, so drawing cost doesn't grow with row count.
+
+Each function takes a Series and returns plain numpy/dict results;
+callers cache them per dataset version.
+"""
+import numpy as np
+
+KDE_SAMPLE = 5_000  # rows the density curve is fitted on
+KDE_POINTS = 200  # points the curve is evaluated at
+MAX_FLIERS = 1_000  # outlier points drawn on a box plot
+
+
+def _values(series):
+    values = series.to_numpy(dtype='float64', na_value=np.nan)
+    return values[~np.isnan(values)]
+
+
+def histogram(series, bins=50):
+    """(counts, edges) of the non-missing values."""
+    return np.histogram(_values(series), bins=bins)
+
+
+def kde_curve(series, edges, sample=KDE_SAMPLE, seed=0):
+    """(x, y) of a Gaussian KDE fitted on at most ``sample`` values, scaled to histogram counts."""
+    values = _values(series)
+    n = len(values)
+    if n > sample:
+        values = np.random.default_rng(seed).choice(values, sample, replace=False)
+    std = values.std(ddof=1) if len(values) > 1 else 0.0
+    x = np.linspace(edges[0], edges[-1], KDE_POINTS)
+    if not std:
+        return x, np.zeros_like(x)
+    bandwidth = std * len(values) ** (-1 / 5)  # Scott's rule
+    z = (x[:, None] - values[None, :]) / bandwidth
+    density = np.exp(-0.5 * z ** 2).sum(axis=1) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+    return x, density * n * (edges[1] - edges[0])
+
+
+def box_stats(series, label=''):
+    """Five-number summary with 1.5*IQR whiskers in the dict format of ``Axes.bxp``."""
+    values = _values(series)
+    if not len(values):
+        return None
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = values[(values >= low) & (values <= high)]
+    fliers = values[(values < low) | (values > high)]
+    if len(fliers) > MAX_FLIERS:
+        fliers = np.random.default_rng(0).choice(fliers, MAX_FLIERS, replace=False)
+    return {'label': label, 'med': med, 'q1': q1, 'q3': q3,
+            'whislo': inside.min(), 'whishi': inside.max(), 'fliers': fliers}
+
+
+def top_counts(top_values, non_null, unique, n):
+    """The n largest of ``top_values`` (value counts, largest first) plus one bucket for all other values."""
+    top = top_values.head(n)
+    top.index = top.index.astype(str)
+    rest = int(non_null - top.sum())
+    if rest > 0:
+        top[f"Other ({int(unique) - len(top)} values)"] = rest
+    return top
+
+
+#===== Category vs. numeric ======
+BOOT_ROUNDS = 1_000  # bootstrap resamples per group
+BOOT_ROWS = 1_000  # rows per group resampled; larger groups are subsampled and the spread rescaled
+
+
+def group_stats(df, cat_col, num_col):
+    """Mean, count and std of num_col per category, from one groupby."""
+    return df.groupby(cat_col, observed=True)[num_col].agg(['mean', 'count', 'std'])
+
+
+def analytic_ci(stats, z=1.96):
+    """Half-width of a normal-approximation 95% interval for each group mean."""
+    return z * stats['std'] / np.sqrt(stats['count'])
+
+
+def bootstrap_ci(df, cat_col, num_col, groups, rounds=BOOT_ROUNDS, seed=0):
+    """(2 x len(groups)) distances from each group mean down/up to its 95% percentile-bootstrap bounds."""
+    rng = np.random.default_rng(seed)
+    sub = df.loc[df[cat_col].isin(groups), [cat_col, num_col]].dropna()
+    values = sub[num_col].to_numpy(dtype='float64')
+    positions = sub.groupby(cat_col, observed=True).indices
+    errors = np.zeros((2, len(groups)))
+    for i, group in enumerate(groups):
+        v = values[positions.get(group, [])]
+        if len(v) < 2:
+            continue
+        scale = 1.0
+        if len(v) > BOOT_ROWS:
+            scale = np.sqrt(BOOT_ROWS / len(v))  # SE shrinks with sqrt(n)
+            v = rng.choice(v, BOOT_ROWS, replace=False)
+        means = v[rng.integers(0, len(v), (rounds, len(v)))].mean(axis=1)
+        low, high = np.percentile(means, [2.5, 97.5])
+        center = v.mean()
+        errors[:, i] = (center - low) * scale, (high - center) * scale
+    return errors
@@ -1,15 +1,17 @@
 import streamlit as st
-import io
+from .profiler import get_profile
 
 def preview_data(df):
+    profile = get_profile(df)
     st.subheader("👀 Dataset Preview")
-    st.markdown(f"- **Rows:** {df.shape[0]} | **Columns:** {df.shape[1]}")
+    st.markdown(f"- **Rows:** {profile.n_rows} | **Columns:** {profile.n_cols}")
     st.dataframe(df.head(), use_container_width=True)
 
     st.subheader("📊 Column Types & Info")
-    buf = io.StringIO()
-    df.info(buf=buf)
-    st.code(buf.getvalue(), language='text')
+    st.markdown(f"- **Memory usage:** {profile.total_memory() / 1024 ** 2:.2f} MB")
+    info = profile.stats[['Dtype', 'Non-Null', 'Nulls', 'Unique', 'Memory (bytes)']]
+    st.dataframe(info, use_container_width=True)
 
     st.subheader("📈 Descriptive Statistics")
-    st.dataframe(df.describe(include='all').T, use_container_width=True)
+    described = profile.stats.drop(columns=['Dtype', 'Nulls', 'Null %', 'Memory (bytes)'])
+    st.dataframe(described.astype({'Top': str}), use_container_width=True)
@@ -0,0 +1,127 @@
+import streamlit as st
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from .utils import get_dataset
+from .core import numeric_columns, categorical_columns, row_null_counts
+
+TOP_VALUES = 50  # most frequent values kept per categorical column (bar plots draw from these)
+STAT_COLUMNS = ['Dtype', 'Non-Null', 'Nulls', 'Null %', 'Unique', 'Memory (bytes)',
+                'Min', '25%', '50%', '75%', 'Max', 'Mean', 'Std', 'Top', 'Freq']
+NUMERIC_STATS = STAT_COLUMNS[6:13]  # only there when some column is numeric
+DERIVED_MAX = 16  # derived results kept per profile, least recently used dropped first
+
+
+#===== Column profile ======
+def column_stats(df, num_cols, cat_cols, row_nulls=False):
+    """Stats rows for the columns of df (see DatasetProfile) and top values of the categorical ones.
+
+    With ``row_nulls``, also each row's null count from the same isna() pass (else None).
+    """
+    n = len(df)
+    na = df.isna()
+    nulls = na.sum()
+    stats = pd.DataFrame(index=df.columns)
+    stats['Dtype'] = df.dtypes.astype(str)
+    stats['Non-Null'] = n - nulls
+    stats['Nulls'] = nulls
+    stats['Null %'] = (nulls / n * 100) if n else 0.0
+    stats['Unique'] = df.nunique()
+    stats['Memory (bytes)'] = df.memory_usage(deep=True, index=False)
+
+    if num_cols:
+        num = df[num_cols]
+        quant = num.quantile([0, 0.25, 0.5, 0.75, 1]).T
+        quant.columns = ['Min', '25%', '50%', '75%', 'Max']
+        stats = stats.join(quant)
+        stats['Mean'] = num.mean()
+        stats['Std'] = num.std()
+
+    top_values, tops, freqs = {}, {}, {}
+    for col in cat_cols:
+        counts = df[col].value_counts()
+        top_values[col] = counts.head(TOP_VALUES)
+        if not counts.empty:
+            tops[col], freqs[col] = counts.index[0], counts.iloc[0]
+    stats['Top'] = pd.Series(tops, dtype='object')
+    stats['Freq'] = pd.Series(freqs, dtype='float64')
+    return stats, top_values, na.sum(axis=1).to_numpy(dtype='int64') if row_nulls else None
+
+
+class DatasetProfile:
+    """Per-column statistics, recomputed only for the columns an edit changed.
+
+    ``stats`` has one row per column with dtype, null counts, memory,
+    cardinality, numeric quantiles/mean/std and the top categorical values.
+    ``column_keys`` are the dataset's column stamps (see modules.dataset);
+    rows of ``previous`` whose stamp is unchanged are reused.
+    """
+
+    def __init__(self, df, column_keys=None, previous=None):
+        self.n_rows = len(df)
+        self.n_cols = df.shape[1]
+        self.num_cols = numeric_columns(df)
+        self.cat_cols = categorical_columns(df)
+        self.column_keys = column_keys or {}
+        self._df = df
+
+        kept = []
+        if previous is not None:
+            kept = [col for col in df.columns
+                    if col in previous.column_keys and previous.column_keys[col] == self.column_keys.get(col)]
+        stale = df.columns.difference(kept, sort=False).tolist()
+        stats, self.top_values, self._row_nulls = column_stats(
+            df[stale], [c for c in self.num_cols if c in stale], [c for c in self.cat_cols if c in stale],
+            row_nulls=not kept)
+        if kept:
+            stats = pd.concat([previous.stats.loc[kept], stats]).reindex(df.columns)
+            stats = stats[[c for c in STAT_COLUMNS if c in stats and (c not in NUMERIC_STATS or self.num_cols)]]
+            self.top_values.update({col: previous.top_values[col] for col in kept if col in previous.top_values})
+        self.stats = stats
+        # results tied to column stamps outlive the version they were computed for, while those columns are unchanged
+        current = set(self.column_keys.values())
+        self._derived = OrderedDict() if previous is None else OrderedDict(
+            (key, entry) for key, entry in previous._derived.items()
+            if entry[0] is not None and current.issuperset(entry[0]))
+
+    #===== Views used by the tabs ======
+    def null_summary(self):
+        """Columns with missing values as a Column / Null % frame."""
+        null_per = self.stats['Null %'].rename_axis('Column').reset_index()
+        return null_per[null_per['Null %'] > 0].reset_index(drop=True)
+
+    @property
+    def row_nulls(self):
+        """Per-row null counts, for row drops; counted here only when the profile was updated incrementally."""
+        if self._row_nulls is None:
+            if self.stats['Nulls'].sum():
+                self._row_nulls = row_null_counts(self._df)
+            else:
+                self._row_nulls = np.zeros(self.n_rows, dtype='int64')
+        return self._row_nulls
+
+    def derived(self, key, compute, columns=None):
+        """Result of compute(), rebuilt for a new version, or only when one of ``columns`` changes if given."""
+        stamp = None if columns is None else tuple(self.column_keys[col] for col in columns)
+        entry = self._derived.get(key)
+        if entry is None or entry[0] != stamp:
+            entry = self._derived[key] = (stamp, compute())
+        self._derived.move_to_end(key)
+        while len(self._derived) > DERIVED_MAX:
+            self._derived.popitem(last=False)
+        return entry[1]
+
+    def total_memory(self):
+        return int(self.stats['Memory (bytes)'].sum())
+
+
+#===== Cached access ======
+def get_profile(df):
+    """Profile of df, updated from the previous one when the dataset version changes."""
+    dataset = get_dataset()
+    cached = st.session_state.get('profile')
+    if cached is None or cached[0] != dataset.key:
+        keys = {col: dataset.column_key(col) for col in df.columns}
+        previous = cached[1] if cached is not None and cached[0][0] == dataset.uid else None
+        st.session_state.profile = (dataset.key, DatasetProfile(df, keys, previous))
+    return st.session_state.profile[1]
@@ -0,0 +1,268 @@
+import io
+import os
+import re
+import urllib.request
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, fall back to the pandas C parser
+    pa = None
+
+BLOCK_SIZE = 16 << 20  # bytes parsed per chunk
+PANDAS_NA_EXTRAS = ['<NA>', 'None']  # pandas defaults that pyarrow doesn't treat as null
+NA_SENTINELS = ['-', 'n/a', 'N/A', 'missing']  # extra markers read as missing
+FILE_FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet',
+                '.feather': 'feather', '.arrow': 'ipc', '.ipc': 'ipc'}
+
+
+#===== Source handling ======
+class _ProgressReader(io.RawIOBase):
+    """Wrap a binary stream and count the bytes handed to the parser."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunk = self.raw.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _open_source(file):
+    """Return (stream, size_in_bytes, owned) for an upload, a local path or a URL."""
+    if isinstance(file, str):
+        if file.startswith(("http://", "https://")):
+            resp = urllib.request.urlopen(file)
+            size = resp.headers.get("Content-Length")
+            return resp, int(size) if size else None, True
+        return open(file, "rb"), os.path.getsize(file), True
+    file.seek(0)
+    return file, _stream_size(file), False
+
+
+def _stream_size(stream):
+    if getattr(stream, "size", None) is not None:
+        return stream.size
+    if hasattr(stream, "getbuffer"):
+        return stream.getbuffer().nbytes
+    try:
+        return os.fstat(stream.fileno()).st_size
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        return None
+
+
+def file_format(file):
+    """Format of an upload, path or URL, guessed from its extension (CSV by default)."""
+    name = file if isinstance(file, str) else file.name
+    ext = os.path.splitext(name.split("?")[0])[1].lower()
+    return FILE_FORMATS.get(ext, 'csv')
+
+
+#===== Arrow-backed dtypes ======
+def _arrow_dtype(pa_type):
+    if pa.types.is_integer(pa_type):
+        # same width and signedness, so uint64 and compact int8/16/32 columns round-trip
+        return pd.api.types.pandas_dtype(f"{'Int' if pa.types.is_signed_integer(pa_type) else 'UInt'}{pa_type.bit_width}")
+    if pa.types.is_boolean(pa_type):
+        return pd.BooleanDtype()
+    if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type):
+        return pd.StringDtype("pyarrow")
+    return None  # floats and timestamps stay on numpy
+
+
+#===== Chunked CSV parsing ======
+def _csv_options(na_values, column_types):
+    null_values = pv.ConvertOptions().null_values + PANDAS_NA_EXTRAS + list(na_values)
+    return pv.ConvertOptions(null_values=null_values, strings_can_be_null=True, column_types=column_types)
+
+
+def _casts(array, pa_type):
+    try:
+        pc.cast(array, pa_type)
+        return True
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+
+
+def widen_column_types(file, na_values, error, reader, column_types):
+    """Column types every block fits, after a later block did not fit the first block's schema.
+
+    One extra pass reads the inferred columns as text and tries each block
+    against the first block's type, then float64 for integers (and
+    all-null first blocks), then falls back to string. Every column that
+    needs widening is found in this one pass. Re-raises ``error`` if it
+    is not a column type mismatch.
+    """
+    if reader is None or re.search(r"CSV column #(\d+)", str(error)) is None:
+        raise error
+    ladders = {}
+    for field in reader.schema:
+        if field.name in column_types or pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            continue
+        if pa.types.is_null(field.type):
+            ladders[field.name] = [pa.int64(), pa.float64(), pa.string()]
+        elif pa.types.is_integer(field.type):
+            ladders[field.name] = [field.type, pa.float64(), pa.string()]
+        else:
+            ladders[field.name] = [field.type, pa.string()]
+
+    probe = _csv_options(na_values, {**column_types, **{name: pa.string() for name in ladders}})
+    stream, _, owned = _open_source(file)
+    try:
+        for batch in pv.open_csv(stream, read_options=pv.ReadOptions(block_size=BLOCK_SIZE), convert_options=probe):
+            for name, ladder in ladders.items():
+                while len(ladder) > 1 and not _casts(batch.column(name), ladder[0]):
+                    ladder.pop(0)
+    finally:
+        if owned:
+            stream.close()
+    widened = {name: ladder[0] for name, ladder in ladders.items() if ladder[0] != reader.schema.field(name).type}
+    if not widened:
+        raise error
+    return {**column_types, **widened}
+
+
+class ColumnTypeChanged(Exception):
+    """A later CSV block did not fit the types inferred from the first block.
+
+    ``column_types`` holds types (name -> Arrow type) that fit every block.
+    """
+
+    def __init__(self, column_types):
+        super().__init__(f"columns {sorted(column_types)} changed type after the first block")
+        self.column_types = column_types
+
+
+def iter_csv_chunks(file, na_values=NA_SENTINELS, column_types=None):
+    """Yield a CSV as Arrow-backed DataFrame chunks without loading the whole file.
+
+    The schema comes from the first block. If a later block doesn't fit it,
+    ColumnTypeChanged is raised with types that fit the whole file; pass
+    them as ``column_types`` and start again.
+    """
+    if pa is None:
+        stream, _, owned = _open_source(file)
+        try:
+            yield from pd.read_csv(stream, na_values=list(na_values), chunksize=100_000)
+        finally:
+            if owned:
+                stream.close()
+        return
+
+    column_types = dict(column_types or {})
+    stream, _, owned = _open_source(file)
+    reader = None
+    try:
+        reader = pv.open_csv(stream, read_options=pv.ReadOptions(block_size=BLOCK_SIZE),
+                             convert_options=_csv_options(na_values, column_types))
+        try:
+            for batch in reader:
+                yield batch.to_pandas(types_mapper=_arrow_dtype)
+        except pa.ArrowInvalid as e:
+            raise ColumnTypeChanged(widen_column_types(file, na_values, e, reader, column_types)) from e
+    finally:
+        if owned:
+            stream.close()
+
+
+def read_csv_chunked(file, na_values=NA_SENTINELS, progress=None):
+    """Parse a CSV block by block with pyarrow and return an Arrow-backed DataFrame.
+
+    ``na_values`` are turned into nulls by the parser itself, so no
+    replace pass over the finished frame is needed. Returns the frame and
+    a Series with the number of missing cells found in each column.
+    ``progress`` is called with a 0-1 fraction after each parsed block.
+    Columns whose type changes after the first block are widened (see
+    widen_column_types) and the file is read once more.
+    """
+    if pa is None:
+        stream, _, owned = _open_source(file)
+        try:
+            df = pd.read_csv(stream, na_values=list(na_values))
+        finally:
+            if owned:
+                stream.close()
+        return df, df.isna().sum()
+
+    column_types = {}
+    while True:
+        convert = _csv_options(na_values, column_types)
+        stream, size, owned = _open_source(file)
+        source = _ProgressReader(stream)
+        reader = None
+        try:
+            reader = pv.open_csv(source, read_options=pv.ReadOptions(block_size=BLOCK_SIZE), convert_options=convert)
+            batches = []
+            missing = dict.fromkeys(reader.schema.names, 0)
+            for batch in reader:
+                batches.append(batch)
+                for name, column in zip(batch.schema.names, batch.columns):
+                    missing[name] += column.null_count
+                if progress and size:
+                    progress(min(source.bytes_read / size, 1.0))
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            break
+        except pa.ArrowInvalid as e:
+            column_types = widen_column_types(file, na_values, e, reader, column_types)
+        finally:
+            if owned:
+                stream.close()
+
+    del batches
+    df = table.to_pandas(types_mapper=_arrow_dtype, split_blocks=True, self_destruct=True)
+    return df, pd.Series(missing, dtype='int64')
+
+
+#===== Columnar formats ======
+def read_schema(stream, fmt):
+    """Column names of a Parquet / Feather / Arrow IPC file, read from its metadata only."""
+    stream.seek(0)
+    if fmt == 'parquet':
+        names = pq.read_schema(stream).names
+    else:
+        names = _open_ipc(stream).schema.names
+    stream.seek(0)
+    return names
+
+
+def _open_ipc(stream):
+    try:
+        return pa.ipc.open_file(stream)
+    except pa.ArrowInvalid:  # not the random-access file layout, try the stream layout
+        stream.seek(0)
+        return pa.ipc.open_stream(stream)
+
+
+def read_columnar(stream, fmt, columns=None):
+    """Read a Parquet / Feather / Arrow IPC file, loading only ``columns`` if given."""
+    if pa is None:
+        raise ImportError(f"pyarrow is required to read {fmt} files")
+    stream.seek(0)
+    if fmt == 'parquet':
+        table = pq.read_table(stream, columns=columns)
+    elif fmt == 'feather':
+        table = feather.read_table(stream, columns=columns)
+    else:
+        table = _open_ipc(stream).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    missing = {name: table.column(name).null_count for name in table.column_names}
+    # pandas metadata in the file restores the original dtypes
+    df = table.to_pandas(types_mapper=_arrow_dtype, split_blocks=True, self_destruct=True)
+    return df, pd.Series(missing, dtype='int64')
+
+
+def read_file(stream, fmt, na_values=NA_SENTINELS, columns=None, progress=None):
+    """Dispatch to the CSV or columnar reader. Missing-value markers only apply to CSV."""
+    if fmt == 'csv':
+        return read_csv_chunked(stream, na_values, progress=progress)
+    return read_columnar(stream, fmt, columns)
@@ -0,0 +1,162 @@
+"""Serializable cleaning recipes: record steps in the UI, replay them anywhere.
+
+A recipe is a list of steps ``{"op": name, "params": {...}}`` whose
+parameters are fully resolved (the actual median, the actual IQR bounds),
+so replaying on the full data gives the same edits as on the sample.
+"""
+import json
+import math
+import numpy as np
+import pandas as pd
+from . import core, imputation, near_duplicates
+from .export import write_csv
+from .readers import NA_SENTINELS, ColumnTypeChanged, iter_csv_chunks
+from .sketches import DEFAULT_K, FrameSketch
+
+RECIPE_VERSION = 1
+
+# op name -> function(df, **params)
+OPERATIONS = {
+    'drop_duplicates': core.drop_duplicates,
+    'drop_columns': core.drop_columns,
+    'drop_null_rows': core.drop_null_rows,
+    'fill_nulls': core.fill_nulls,
+    'fill_by_group': imputation.fill_by_group,
+    'drop_outliers': core.drop_outliers,
+    'cap_outliers': core.cap_outliers,
+    'convert_type': core.convert_type,
+    'convert_columns': core.convert_columns,
+    'convert_dtypes': core.convert_dtypes,
+    # clustered within each chunk when replayed with replay_csv
+    'drop_near_duplicates': near_duplicates.drop_near_duplicates,
+    'merge_near_duplicates': near_duplicates.merge_near_duplicates,
+    # neighbours are searched within each chunk when replayed with replay_csv
+    'knn_impute': imputation.knn_impute,
+}
+
+
+#===== Building steps ======
+def _plain(value):
+    """Make numpy/pandas values JSON friendly."""
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, pd.Index, np.ndarray)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def make_step(op, **params):
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown recipe step: {op}")
+    return {"op": op, "params": _plain(params)}
+
+
+def to_json(steps):
+    return json.dumps({"version": RECIPE_VERSION, "steps": steps}, indent=2)
+
+
+def load_recipe(text):
+    """Steps from a recipe JSON string."""
+    recipe = json.loads(text)
+    steps = recipe["steps"] if isinstance(recipe, dict) else recipe
+    for step in steps:
+        if step["op"] not in OPERATIONS:
+            raise ValueError(f"Unknown recipe step: {step['op']}")
+    return steps
+
+
+#===== Replay ======
+def apply_recipe(df, steps):
+    """Replay steps on a frame that fits in memory."""
+    for step in steps:
+        df = OPERATIONS[step["op"]](df, **step["params"])
+    return df
+
+
+class HashSet:
+    """Row hashes seen so far, as sorted uint64 runs: 8 bytes per hash.
+
+    Runs are merged when a new one is at least as long as the last, so
+    there are O(log n) runs and each hash is copied O(log n) times.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def contains(self, hashes):
+        """Boolean array: which of ``hashes`` were added before."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[pos] == hashes
+        return found
+
+    def add(self, hashes):
+        """Add hashes that are distinct and not in the set yet."""
+        run = np.sort(np.asarray(hashes, dtype='uint64'))
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self.runs.pop(), run]), kind='stable')
+        if len(run):
+            self.runs.append(run)
+
+
+def _apply_to_chunk(chunk, steps, seen):
+    """Replay steps on one chunk; ``seen`` holds row hashes per dedupe step across chunks."""
+    for i, step in enumerate(steps):
+        if step["op"] == "drop_duplicates":
+            subset = step["params"].get("subset")
+            hashes = pd.util.hash_pandas_object(chunk if subset is None else chunk[subset], index=False).to_numpy()
+            known = seen.setdefault(i, HashSet())
+            dup = pd.Series(hashes).duplicated().to_numpy() | known.contains(hashes)
+            known.add(hashes[~dup])
+            chunk = chunk[~dup]
+        else:
+            chunk = OPERATIONS[step["op"]](chunk, **step["params"])
+    return chunk
+
+
+def replay_csv(steps, src, out, na_values=NA_SENTINELS, sketch=None):
+    """Stream a CSV through the recipe chunk by chunk and write CSV to the binary stream ``out``.
+
+    Only one chunk (plus one 8-byte hash per kept row for dedupe steps) is
+    in memory at a time. A FrameSketch passed as ``sketch`` is fed every
+    written chunk. Returns (rows_in, rows_out).
+    """
+    column_types = {}
+    while True:
+        out.seek(0)
+        out.truncate()
+        seen, rows_in, rows_out = {}, 0, 0
+        if sketch is not None:
+            sketch.columns.clear()
+        try:
+            for i, chunk in enumerate(iter_csv_chunks(src, na_values, column_types)):
+                rows_in += len(chunk)
+                chunk = _apply_to_chunk(chunk, steps, seen)
+                write_csv(chunk, out, header=i == 0)
+                if sketch is not None:
+                    sketch.update(chunk)
+                rows_out += len(chunk)
+            return rows_in, rows_out
+        except ColumnTypeChanged as e:
+            # restart with types that fit the whole file, as the in-memory loader does
+            column_types = e.column_types
+
+
+def sketch_csv(steps, src, na_values=NA_SENTINELS, k=DEFAULT_K):
+    """FrameSketch of a CSV after replaying ``steps``, built in one streaming pass."""
+    column_types = {}
+    while True:
+        sketch, seen = FrameSketch(k), {}
+        try:
+            for chunk in iter_csv_chunks(src, na_values, column_types):
+                sketch.update(_apply_to_chunk(chunk, steps, seen))
+            return sketch
+        except ColumnTypeChanged as e:
+            column_types = e.column_types
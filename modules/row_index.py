@@ -0,0 +1,71 @@
+"""Row-hash index for duplicate detection on any subset of key columns.
+
+Each column is hashed once (``pd.util.hash_pandas_object``) into a uint64
+array; a row's key for a subset is those column hashes combined. After
+an edit the index is carried over instead of rebuilt: dropped rows are
+sliced out of the stored hashes and only edited columns are re-hashed.
+Two different rows share a 64-bit key with negligible probability.
+"""
+import numpy as np
+import pandas as pd
+
+_MULT = np.uint64(0x100000001B3)  # FNV-1a 64-bit prime
+
+
+class RowHashIndex:
+    """Column hashes of one frame; row keys and duplicate masks derived from them on demand."""
+
+    def __init__(self, df):
+        self.df = df
+        self.columns = {}  # column -> uint64 hash per row, filled lazily
+        self._keys = {}  # subset -> combined row keys
+
+    #===== Hashes ======
+    def column_hash(self, col):
+        if col not in self.columns:
+            values = self.df[col]
+            if pd.api.types.is_float_dtype(values):
+                values = values + 0.0  # -0.0 becomes 0.0, which pandas counts as equal
+            self.columns[col] = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        return self.columns[col]
+
+    def row_keys(self, subset=None):
+        subset = tuple(self.df.columns if subset is None else subset)
+        if subset not in self._keys:
+            keys = np.zeros(len(self.df), dtype='uint64')
+            with np.errstate(over='ignore'):
+                for col in subset:
+                    keys = (keys * _MULT) ^ self.column_hash(col)
+            self._keys[subset] = keys
+        return self._keys[subset]
+
+    #===== Duplicates ======
+    def duplicated(self, subset=None):
+        """Boolean array of rows that repeat an earlier row on ``subset``, like DataFrame.duplicated."""
+        return pd.Series(self.row_keys(subset)).duplicated().to_numpy()
+
+    def groups(self, subset=None):
+        """One row per duplicated key: Key, First Row (position) and Copies, most copies first."""
+        keys, first, counts = np.unique(self.row_keys(subset), return_index=True, return_counts=True)
+        repeated = counts > 1
+        groups = pd.DataFrame({'Key': keys[repeated], 'First Row': first[repeated], 'Copies': counts[repeated]})
+        return groups.sort_values(['Copies', 'First Row'], ascending=[False, True], ignore_index=True)
+
+    def members(self, key, subset=None):
+        """Positions of the rows in one group."""
+        return np.flatnonzero(self.row_keys(subset) == key)
+
+    #===== Carrying the index across an edit ======
+    def after_row_drop(self, df, dropped):
+        """Index of ``df``, the frame left after removing the rows where ``dropped`` is True."""
+        keep = ~np.asarray(dropped, dtype=bool)
+        index = RowHashIndex(df)
+        index.columns = {col: hashes[keep] for col, hashes in self.columns.items() if col in df.columns}
+        return index
+
+    def after_column_edit(self, df, edited):
+        """Index of ``df`` after the ``edited`` columns were replaced, dropped or added."""
+        index = RowHashIndex(df)
+        index.columns = {col: hashes for col, hashes in self.columns.items()
+                         if col in df.columns and col not in edited}
+        return index
@@ -0,0 +1,154 @@
+"""Mergeable quantile sketches, for statistics over data read a chunk at a time.
+
+A KLLSketch keeps O(k log n) of the values it has seen, each standing in
+for 2**level originals, and answers quantile queries with a rank error
+of about ``rank_error(k)`` (1.3% for the default k=200). Sketches of
+different chunks, files or worker processes merge into the sketch of the
+combined data. Count, mean, std, min and max are tracked exactly.
+"""
+import math
+import numpy as np
+import pandas as pd
+from . import core
+
+DEFAULT_K = 200
+LEVEL_SHRINK = 2 / 3  # each lower level holds 2/3 as many values as the one above
+
+
+def rank_error(k):
+    """Approximate normalized rank error of a single quantile query (empirical KLL constants)."""
+    return 2.296 / k ** 0.9723
+
+
+def k_for_error(error):
+    """Smallest k whose rank error is at most ``error`` (e.g. 0.01 for 1%)."""
+    return max(8, math.ceil((2.296 / error) ** (1 / 0.9723)))
+
+
+#===== One column ======
+class KLLSketch:
+    """Quantile sketch of a stream of floats. Missing values are skipped."""
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self._add_moments(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        if other.n:
+            self._add_moments(other.n, other.mean, other.m2, other.min, other.max)
+            for h, items in enumerate(other.levels):
+                if h == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = np.concatenate([self.levels[h], items])
+            self._compress()
+        return self
+
+    def _add_moments(self, n, mean, m2, low, high):
+        # Chan et al. parallel update of mean and variance
+        total = self.n + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+        self.min, self.max = min(self.min, low), max(self.max, high)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * LEVEL_SHRINK ** depth))
+
+    def _compress(self):
+        while sum(map(len, self.levels)) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h, items in enumerate(self.levels) if len(items) >= self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            odd = len(items) % 2
+            # keep every other value at double weight, starting at a random offset
+            promoted = items[odd:][self._rng.integers(2)::2]
+            self.levels[level] = items[:odd]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def quantile(self, q):
+        """Approximate quantile(s) for q in [0, 1]; NaN for an empty sketch."""
+        qs = np.atleast_1d(np.asarray(q, dtype='float64'))
+        if not self.n:
+            result = np.full(len(qs), np.nan)
+        else:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level), 2 ** h) for h, level in enumerate(self.levels)])
+            order = np.argsort(items, kind='stable')
+            items, cumulative = items[order], np.cumsum(weights[order])
+            idx = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+            result = items[np.minimum(idx, len(items) - 1)]
+            result[qs <= 0], result[qs >= 1] = self.min, self.max
+        return result if np.ndim(q) else float(result[0])
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else math.nan
+
+
+#===== Every numeric column of a frame ======
+class FrameSketch:
+    """One KLLSketch per numeric column, fed chunk by chunk."""
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.seed = seed
+        self.columns = {}
+
+    def update(self, df):
+        for col in core.numeric_columns(df):
+            if col not in self.columns:
+                self.columns[col] = KLLSketch(self.k, self.seed)
+            self.columns[col].update(df[col].to_numpy(dtype='float64', na_value=np.nan))
+        return self
+
+    def merge(self, other):
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                self.columns[col] = sketch
+        return self
+
+    def outlier_bounds(self, columns=None, method='iqr', k=None):
+        """{column: (low, high)} as core.outlier_bounds gives, from the sketches. MAD needs exact data."""
+        k = core.OUTLIER_METHODS[method] if k is None else k
+        bounds = {}
+        for col in (self.columns if columns is None else columns):
+            sketch = self.columns[col]
+            if method == 'iqr':
+                q1, q3 = sketch.quantile([0.25, 0.75])
+                bounds[col] = (q1 - k * (q3 - q1), q3 + k * (q3 - q1))
+            elif method == 'zscore':
+                bounds[col] = (sketch.mean - k * sketch.std, sketch.mean + k * sketch.std)
+            else:
+                raise ValueError(f"Outlier method {method!r} can't be computed from a sketch")
+        return {col: (float(low), float(high)) for col, (low, high) in bounds.items()}
+
+    def describe(self):
+        """Per-column count, mean, std and approximate quartiles, like DataFrame.describe()."""
+        rows = {}
+        for col, sketch in self.columns.items():
+            q = sketch.quantile([0.25, 0.5, 0.75])
+            rows[col] = {'count': sketch.n, 'mean': sketch.mean, 'std': sketch.std, 'min': sketch.min,
+                         '25%': q[0], '50%': q[1], '75%': q[2], 'max': sketch.max}
+        return pd.DataFrame.from_dict(rows, orient='index')
@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+import weakref
+import pandas as pd
+
+UNDO_BUDGET_MB = int(os.environ.get("CLEANER_UNDO_MB", 512))
+
+
+#===== Spilling frames to disk ======
+def _write_frame(df, path):
+    """Write df as Parquet, falling back to pickle for columns Arrow can't store."""
+    try:
+        df.to_parquet(path + ".parquet")
+        return path + ".parquet"
+    except (ValueError, TypeError, ImportError):
+        df.to_pickle(path + ".pkl")
+        return path + ".pkl"
+
+
+def _read_frame(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+class Spillable:
+    """Mixin for change records whose DataFrame attributes can move to disk.
+
+    Subclasses list those attributes in FRAMES.
+    """
+
+    FRAMES = ()
+    step = None  # recipe step of the edit this record belongs to
+
+    def nbytes(self):
+        if getattr(self, "_spilled", None):
+            return 0
+        return int(sum(getattr(self, name).memory_usage(deep=True).sum() for name in self.FRAMES))
+
+    def spill(self, prefix):
+        self._spilled = {}
+        for name in self.FRAMES:
+            self._spilled[name] = _write_frame(getattr(self, name), f"{prefix}-{name}")
+            setattr(self, name, None)
+
+    def load(self):
+        for name, path in (getattr(self, "_spilled", None) or {}).items():
+            setattr(self, name, _read_frame(path))
+            os.remove(path)
+        self._spilled = None
+
+
+#===== Undo / redo store ======
+class SnapshotStore:
+    """Undo and redo stacks kept under a memory budget.
+
+    When the records in memory exceed the budget, the oldest ones are
+    written to a private temp directory and read back when they are
+    undone. The newest undo record always stays in memory.
+    """
+
+    def __init__(self, budget_bytes=UNDO_BUDGET_MB << 20):
+        self.budget_bytes = budget_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+        self._dir = None
+        self._count = 0
+
+    def __len__(self):
+        return len(self.undo_stack)
+
+    def __bool__(self):
+        return bool(self.undo_stack)
+
+    def memory_bytes(self):
+        return sum(change.nbytes() for change in self.undo_stack + self.redo_stack)
+
+    def push(self, change):
+        self.undo_stack.append(change)
+        self.redo_stack = []  # a new edit forks the history
+        self._enforce_budget()
+
+    def undo(self, current):
+        """Return (frame before the last edit, what changed as Dataset.update arguments), or None."""
+        if not self.undo_stack:
+            return None
+        change = self.undo_stack.pop()
+        change.load()
+        previous, redo, changed = change.restore(current)
+        redo.step = change.step
+        self.redo_stack.append(redo)
+        self._enforce_budget()
+        return previous, changed
+
+    def redo(self, current):
+        if not self.redo_stack:
+            return None
+        change = self.redo_stack.pop()
+        change.load()
+        following, undo, changed = change.restore(current)
+        undo.step = change.step
+        self.undo_stack.append(undo)
+        self._enforce_budget()
+        return following, changed
+
+    def steps(self):
+        """Recipe steps of the edits currently applied, oldest first. A reset starts over."""
+        steps = []
+        for change in self.undo_stack:
+            if change.step is None:
+                continue
+            if change.step["op"] == "reset":
+                steps = []
+            else:
+                steps.append(change.step)
+        return steps
+
+    def clear(self):
+        self.undo_stack, self.redo_stack = [], []
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def _enforce_budget(self):
+        used = self.memory_bytes()
+        # oldest redo records first, then oldest undo records
+        candidates = self.redo_stack[:-1] + self.undo_stack[:-1]
+        for change in candidates:
+            if used <= self.budget_bytes:
+                break
+            size = change.nbytes()
+            if size:
+                change.spill(self._next_prefix())
+                used -= size
+
+    def _next_prefix(self):
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix="cleaner-undo-")
+            weakref.finalize(self, shutil.rmtree, self._dir, True)
+        self._count += 1
+        return os.path.join(self._dir, str(self._count))
@@ -1,8 +1,20 @@
 import streamlit as st
 import pandas as pd
-from .undo_reset import save_snapshot
+from .undo_reset import apply_edit
+from . import core
+from .recipe import make_step
+from .viewer import show_rows
+from .profiler import get_profile
+from .utils import get_dataset
 
 def type_convertor(df):
+    mode = st.radio("Mode", ["Convert a column", "Convert many columns", "Optimize memory"], horizontal=True, key="convert_mode")
+    if mode == "Optimize memory":
+        optimize_memory(df)
+        return
+    if mode == "Convert many columns":
+        batch_convert(df)
+        return
     st.subheader("🔄 Type Converter")
 
     cols = df.columns.tolist()
@@ -10,56 +22,126 @@ def type_convertor(df):
     curr_type = df[selected].dtype
     st.write(f"Current dtype: **{curr_type}**")
 
-    new_type = st.selectbox("Convert to type", ["int", "float", "str", "datetime"])
+    new_type = st.selectbox("Convert to type", core.CONVERT_TYPES)
 
     # ==== Preview conversion ====
     if st.button("Preview Conversion"):
         try:
-            if new_type == "int":
-                converted = pd.to_numeric(df[selected], errors='coerce').astype("Int64")
-            elif new_type == "float":
-                converted = pd.to_numeric(df[selected], errors='coerce').astype(float)
-            elif new_type == "str":
-                converted = df[selected].astype(str)
-            elif new_type == "datetime":
-                converted = pd.to_datetime(df[selected], errors='coerce')
-
-            nulls = converted.isna().sum()
-            total = len(converted)
-            pct = round((nulls / total) * 100, 2)
-
-            if pct > 0:
-                st.warning(f"{nulls} values ({pct}%) will become NaN.")
-                failed_rows = df[converted.isna()]
-                if not failed_rows.empty:
-                    st.write(f"❌ {failed_rows.shape[0]} rows failed to convert:")
-                    st.dataframe(failed_rows)
-            else:
-                st.success("✅ Safe conversion. No nulls introduced.")
+            converted = core.convert_series(df[selected], new_type)
 
             # Store preview in session
             st.session_state.converted_col = converted
             st.session_state.converted_col_name = selected
             st.session_state.new_dtype = new_type
+            st.session_state.converted_stamp = get_dataset().column_key(selected)
 
         except Exception as e:
             st.error(f"⚠️ Conversion error: {e}")
 
+    # kept across reruns so the failed rows can be paged through, until the column changes
+    previewed = (st.session_state.get("converted_col_name") == selected
+                 and st.session_state.get("converted_stamp") == get_dataset().column_key(selected))
+    if previewed and st.session_state.get("new_dtype") == new_type:
+        converted = st.session_state.converted_col
+        failed = (converted.isna() & df[selected].notna()).to_numpy()
+        nulls = int(failed.sum())
+        pct = round((nulls / len(converted)) * 100, 2) if len(converted) else 0.0
+
+        if nulls:
+            st.warning(f"{nulls} values ({pct}%) will become NaN.")
+            st.write(f"❌ {nulls} rows failed to convert:")
+            show_rows(df, failed, key="failed_rows")
+        else:
+            st.success("✅ Safe conversion. No nulls introduced.")
+
     # ==== Apply conversion ====
     if st.button("Apply Conversion"):
-        if (
-            "converted_col" in st.session_state and 
-            st.session_state.get("converted_col_name") == selected
-        ):
-            save_snapshot(df)
-            df[selected] = st.session_state.converted_col
-            st.session_state.df = df
+        if "converted_col" in st.session_state and previewed:
+            apply_edit(df.assign(**{selected: st.session_state.converted_col}), columns=[selected],
+                       step=make_step('convert_type', column=selected, new_type=st.session_state.new_dtype))
             st.success(f"✅ Column '{selected}' converted to {st.session_state.new_dtype}.")
 
             # Clear to prevent accidental reapply
             del st.session_state.converted_col
             del st.session_state.converted_col_name
             del st.session_state.new_dtype
+            del st.session_state.converted_stamp
         else:
             st.warning("⚠️ Please preview before applying.")
 
+
+# ==== Convert many columns ====
+def batch_convert(df):
+    st.subheader("🔄 Batch Type Converter")
+    plan = pd.DataFrame({'Column': df.columns, 'Current dtype': df.dtypes.astype(str).to_numpy(), 'Convert to': None})
+    edited = st.data_editor(
+        plan, hide_index=True, key="batch_plan",
+        disabled=['Column', 'Current dtype'],
+        column_config={'Convert to': st.column_config.SelectboxColumn(options=core.CONVERT_TYPES)},
+    )
+    types = dict(edited.dropna(subset=['Convert to'])[['Column', 'Convert to']].itertuples(index=False))
+    if not types:
+        st.info("ℹ️ Pick a target type for the columns to convert.")
+        return
+
+    if st.button("Preview Conversions"):
+        try:
+            # columns are parsed in parallel threads
+            stamps = get_dataset().columns_key(types)
+            st.session_state.batch_converted = (types, stamps, core.convert_columns(df[list(types)], types))
+        except Exception as e:
+            st.error(f"⚠️ Conversion error: {e}")
+
+    preview = st.session_state.get("batch_converted")
+    if preview is None or preview[:2] != (types, get_dataset().columns_key(types)):
+        st.caption("Preview to see how many values fail before applying.")
+        return
+    converted = preview[2]
+    failed = converted.isna().to_numpy() & df[list(types)].notna().to_numpy()
+    summary = pd.DataFrame({'Convert to': pd.Series(types), 'Failed values': failed.sum(axis=0)})
+    st.dataframe(summary)
+    if failed.any():
+        st.warning(f"⚠️ {int(failed.any(axis=1).sum())} rows have values that will become NaN.")
+        show_rows(df, failed.any(axis=1), key="batch_failed_rows", columns=list(types))
+    else:
+        st.success("✅ Safe conversion. No nulls introduced.")
+
+    if st.button("Apply Conversions"):
+        apply_edit(df.assign(**{col: converted[col] for col in types}), columns=list(types),
+                   step=make_step('convert_columns', types=types))
+        del st.session_state.batch_converted
+        st.success(f"✅ Converted {len(types)} columns.")
+
+
+# ==== Optimize memory ====
+def optimize_memory(df):
+    st.subheader("🪶 Optimize Memory")
+    profile = get_profile(df)
+    plan = profile.derived(('dtype_plan',), lambda: core.plan_dtypes(df))
+    if not plan:
+        st.success("✅ Every column already uses a compact dtype.")
+        return
+    # the planned columns converted once; Apply reuses them
+    optimized = profile.derived(('dtype_preview',), lambda: core.convert_dtypes(df[list(plan)], plan))
+
+    cols = list(plan)
+    mb = 1024 ** 2
+    table = pd.DataFrame({
+        'Current dtype': profile.stats.loc[cols, 'Dtype'],
+        'Proposed dtype': pd.Series(plan),
+        'Current (MB)': profile.stats.loc[cols, 'Memory (bytes)'] / mb,
+        'Projected (MB)': optimized.memory_usage(deep=True, index=False) / mb,
+    })
+    st.dataframe(table.round(3))
+
+    chosen = st.multiselect("Columns to optimize", cols, default=cols, key="optimize_cols")
+    current = profile.total_memory() / mb
+    saved = (table.loc[chosen, 'Current (MB)'] - table.loc[chosen, 'Projected (MB)']).sum()
+    st.metric("Memory after optimizing", f"{current - saved:.2f} MB", delta=f"-{saved:.2f} MB", delta_color="inverse")
+    st.caption(f"Currently {current:.2f} MB (deep).")
+
+    if chosen and st.button("🪶 Apply Optimization"):
+        dtypes = {col: plan[col] for col in chosen}
+        apply_edit(df.assign(**{col: optimized[col] for col in chosen}), columns=chosen,
+                   step=make_step('convert_dtypes', dtypes=dtypes, bool_words=core.bool_words(df, dtypes)))
+        st.success(f"✅ {len(chosen)} columns converted, about {saved:.2f} MB saved.")
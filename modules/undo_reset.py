@@ -1,26 +1,143 @@
 import streamlit as st
+import numpy as np
+import pandas as pd
+from .utils import get_dataset
+from .snapshot_store import Spillable
+
+# ====== Change records ======
+# Each record keeps only what an edit overwrote. restore(current) rebuilds the
+# frame from before the edit and returns the record that re-applies it (redo),
+# plus what changed as Dataset.update arguments, so only those stamps move.
+
+class ColumnChange(Spillable):
+    """Columns an edit replaced or removed, and the column order before it."""
+
+    FRAMES = ('saved',)
+
+    def __init__(self, df, columns):
+        self.saved = df[columns].copy()
+        self.order = list(df.columns)
+
+    def restore(self, current):
+        # the redo record saves what is there now, including columns the edit added
+        added = [c for c in current.columns if c not in self.order]
+        inverse = ColumnChange(current, [c for c in self.saved if c in current.columns] + added)
+        restored = current.copy(deep=False)
+        for col, series in self.saved.items():
+            restored[col] = series.array
+        return restored[self.order], inverse, {'columns': list(self.saved.columns) + added}
+
+
+class RowChange(Spillable):
+    """Rows an edit dropped, with their positions and the index before it."""
+
+    FRAMES = ('rows',)
+
+    def __init__(self, df, mask):
+        mask = np.asarray(mask, dtype=bool)
+        self.positions = np.flatnonzero(mask)
+        self.rows = df.iloc[self.positions]
+        self.index = df.index
+
+    def restore(self, current):
+        kept = np.ones(len(self.index), dtype=bool)
+        kept[self.positions] = False
+        kept = np.flatnonzero(kept)
+        body = current.set_axis(self.index[kept])
+        order = np.argsort(np.concatenate([kept, self.positions]), kind='stable')
+        restored = pd.concat([body, self.rows]).take(order)
+        return restored, RowRedo(self.positions, current.index), {'rows': True}
+
+
+class RowRedo(Spillable):
+    """Drops the same row positions again; holds no row data."""
+
+    def __init__(self, positions, index):
+        self.positions = positions
+        self.index = index
+
+    def restore(self, current):
+        mask = np.zeros(len(current), dtype=bool)
+        mask[self.positions] = True
+        inverse = RowChange(current, mask)
+        return current[~mask].set_axis(self.index), inverse, {'rows': mask}
+
+
+class FrameChange(Spillable):
+    """A whole frame, for edits that replace everything (reset)."""
+
+    FRAMES = ('frame',)
+
+    def __init__(self, df):
+        self.frame = df  # the frame is being replaced, so no copy is needed
+
+    def restore(self, current):
+        return self.frame, FrameChange(current), {}
+
+
 # ====== Undo Change ======
 def undo_change(df):
     st.subheader("🔁 Undo Change")
-    st.warning("⚠️ This will revert the last change. This action cannot be undone.")
-    if st.button("↩️ Confirm Undo"):
-        if st.session_state.snapshots:
-            st.session_state.df = st.session_state.snapshots.pop()
+    st.warning("⚠️ This will revert the last change. Use Redo to re-apply it.")
+    col1, col2 = st.columns(2)
+    history = st.session_state.snapshots
+    dataset = get_dataset()
+    if col1.button("↩️ Confirm Undo"):
+        undone = history.undo(dataset.df)
+        if undone is not None:
+            previous, changed = undone
+            dataset.update(previous, **changed)
             st.success("✅ Reverted to last saved state.")
         else:
             st.warning("⚠️ No previous state to undo.")
+    if col2.button("↪️ Redo"):
+        redone = history.redo(dataset.df)
+        if redone is not None:
+            following, changed = redone
+            dataset.update(following, **changed)
+            st.success("✅ Change re-applied.")
+        else:
+            st.warning("⚠️ Nothing to redo.")
+    st.caption(f"{len(history.undo_stack)} undo / {len(history.redo_stack)} redo steps, "
+               f"{history.memory_bytes() / 1024 ** 2:.1f} MB in memory")
 
 # ====== saved df before distructive change========
-def save_snapshot(df):
-    """Save a copy of the current DataFrame for undo functionality."""
-    st.session_state.snapshots.append(df.copy())
+def save_snapshot(df, columns=None, rows=None, step=None):
+    """Record what the next edit overwrites so it can be undone.
+
+    Pass ``columns`` for edits that replace or drop columns, or ``rows``
+    (a boolean mask) for edits that drop rows. With neither, the whole
+    frame is kept. ``step`` is the edit's recipe step (see modules.recipe).
+    """
+    if columns is not None:
+        change = ColumnChange(df, list(columns))
+    elif rows is not None:
+        change = RowChange(df, rows)
+    else:
+        change = FrameChange(df)
+    change.step = step
+    st.session_state.snapshots.push(change)
+
+
+def apply_edit(edited, columns=None, rows=None, step=None):
+    """Make ``edited`` the working frame: snapshot what it overwrites, then bump the dataset's stamps.
+
+    ``columns`` and ``rows`` are as for save_snapshot and also tell the
+    caches which columns (or which rows) changed.
+    """
+    dataset = get_dataset()
+    if columns is not None:
+        columns = list(columns)
+    elif rows is not None:
+        rows = np.asarray(rows, dtype=bool)
+    save_snapshot(dataset.df, columns, rows, step)
+    dataset.update(edited, columns=columns, rows=rows)
 
 
 # ====== Reset to Original ======
 def reset_data(original):
     st.subheader("🔁 Reset to Original")
-    st.warning("⚠️ This will reset to raw data Frame. This action cannot be undone.")
+    st.warning("⚠️ This will reset to raw data Frame. You can undo the reset.")
     if st.button("Reset"):
-        save_snapshot(st.session_state.df)
-        st.session_state.df = original.copy()
+        apply_edit(original.copy(deep=False), step={"op": "reset"})  # columns are shared until edited
         st.success("✅ Data reset to original uploaded file.")
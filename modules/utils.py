@@ -1,84 +1,127 @@
 import streamlit as st
 import io
+from collections import OrderedDict
+import matplotlib.pyplot as plt
+from . import core, recipe
+from .export import ExportCache, EXPORT_FORMATS, COMPRESSIONS, export_name
 #===Download function=========
 def download_data(df):
+    """Download button that serializes only when clicked, reusing bytes for the same data version."""
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = ExportCache()
+    cache = st.session_state.export_cache
+    version = get_dataset().key
+
+    fmt = st.selectbox("Download format", list(EXPORT_FORMATS), key="export_format")
+    compression = "None"
+    if fmt == "CSV":
+        compression = st.selectbox("Compression", list(COMPRESSIONS), key="export_compression")
+    file_name, mime = export_name(fmt, compression)
     st.download_button(
-        label="📥 Download Cleaned CSV",
-        data=df.to_csv(index=False),
-        file_name="cleaned_data.csv",
-        mime="text/csv"
+        label=f"📥 Download Cleaned {fmt}",
+        data=lambda: cache.get_or_build(df, version, fmt, compression),  # runs on click only
+        file_name=file_name,
+        mime=mime
     )
 
-#=====  Null summary ======
-def get_null_summary(df):
-    null_per = (df.isnull().mean() * 100).reset_index()
-    null_per.columns = ['Column', 'Null %']
-    return null_per[null_per['Null %'] > 0]
-
-#=====  IQR Method ======
-def get_iqr_bounds(series):
-    Q1 = series.quantile(0.25)
-    Q3 = series.quantile(0.75)
-    IQR = Q3 - Q1
-    return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+#===Recipe download=========
+def download_recipe():
+    steps = st.session_state.snapshots.steps()
+    if steps:
+        with st.expander(f"📜 Cleaning recipe ({len(steps)} steps)"):
+            st.json(steps, expanded=False)
+            st.download_button("📥 Download Recipe (JSON)", recipe.to_json(steps),
+                               file_name="cleaning_recipe.json", mime="application/json")
+            st.caption("Replay on the full file with `python -m modules.cli FILE --recipe cleaning_recipe.json`.")
 
+#=====  Working dataset ======
+def get_dataset():
+    """The session's Dataset (see modules.dataset); tabs read ``.df`` and edit through undo_reset.apply_edit."""
+    return st.session_state.dataset
 
 #=====  Numerical Null Fill and Apply ======
 def numeric_fill_ui(null_df, df):
+    """Ask how to fill each numeric column; returns {column: 'median' | constant}."""
+    methods = {}
     for col in null_df['Column']:
         method = st.radio(f"How to fill {col}?", ['Use constant', 'Use median'], key=f'n_{col}')
         if method == 'Use constant':
-            val = st.number_input(f"Value for {col}", key=f'inp_{col}')
-            st.session_state[f'{col}_value'] = val
-        else:
-            st.session_state[f'{col}_value'] = 'median'
-
-def apply_numeric_fill(null_df, df):
-    for col in null_df['Column']:
-        value = st.session_state.get(f'{col}_value')
-        if value == 'median':
-            med = df[col].median()
-            df[col] = df[col].fillna(med)
-            st.success(f"{col} filled with median ({med})")
+            methods[col] = st.number_input(f"Value for {col}", key=f'inp_{col}')
         else:
-            df[col] = df[col].fillna(value)
-            st.success(f"{col} filled with {value}")
-    return df
+            methods[col] = 'median'
+    return methods
 
 #=====  Categorical Null Fill and Apply ======
 def cat_fill_ui(null_df, df):
+    """Ask how to fill each categorical column; returns {column: 'mode' | constant}."""
+    methods = {}
     for col in null_df['Column']:
         method = st.radio(f"How to fill {col}?", ['Most Frequent', 'User Input'], key=f'c_{col}')
         if method == 'User Input':
-            val = st.text_input(f"Value for {col}", key=f'inp_{col}')
-            st.session_state[f'{col}_value'] = val
+            methods[col] = st.text_input(f"Value for {col}", key=f'inp_{col}')
         else:
-            st.session_state[f'{col}_value'] = 'freq'
+            methods[col] = 'mode'
+    return methods
 
-def apply_cat_fill(null_df, df):
-    for col in null_df['Column']:
-        value = st.session_state.get(f'{col}_value')
-        if value == 'freq':
-            freq = df[col].value_counts().idxmax()
-            df[col] = df[col].fillna(freq)
-            st.success(f"{col} filled with most frequent value: {freq}")
-        else:
-            df[col] = df[col].fillna(value)
-            st.success(f"{col} filled with constant: {value}")
-    return df
+def apply_fills(methods, df):
+    """Resolve and apply fills; returns the filled frame and the values used."""
+    values = core.resolve_fills(df, methods)
+    for col, value in values.items():
+        how = {'median': "median", 'mode': "most frequent value"}.get(methods[col], "constant")
+        st.success(f"{col} filled with {how}: {value}")
+    return core.fill_nulls(df, values), values
 
 
 #=====  Plot ======
-def plot_and_download(fig, file_name):
+FIGURE_CACHE_SIZE = 32  # rendered plots kept per session
+
+
+class FigureCache:
+    """PNG bytes of rendered plots, least recently used dropped first."""
+
+    def __init__(self, max_items=FIGURE_CACHE_SIZE):
+        self.max_items = max_items
+        self._items = OrderedDict()
+
+    def get(self, key):
+        png = self._items.get(key)
+        if png is not None:
+            self._items.move_to_end(key)
+        return png
+
+    def put(self, key, png):
+        self._items[key] = png
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+
+def render_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)  # only the bytes are kept
+    return buf.getvalue()
+
+
+def plot_and_download(key, draw, file_name, columns=None):
+    """Show the plot identified by ``key`` (plot type, columns, options) for the current data.
+
+    ``draw()`` builds the figure and runs only when the plot isn't cached;
+    it is redrawn when one of ``columns`` changes (any edit if not given).
+    The download button hands out the same PNG bytes.
+    """
+    if 'figure_cache' not in st.session_state:
+        st.session_state.figure_cache = FigureCache()
+    cache = st.session_state.figure_cache
+    dataset = get_dataset()
+    key = (dataset.key if columns is None else dataset.columns_key(columns),) + tuple(key)
+    png = cache.get(key)
+    if png is None:
+        png = render_png(draw())
+        cache.put(key, png)
     with st.container():
-        st.pyplot(fig)
+        st.image(png, width="stretch")
         show_download = st.checkbox("📥 Show Download Button", value=True)
 
         if show_download:
-            download_plot(fig, file_name)
-
-#=====  Download Plot ======
-def download_plot(fig, filename):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    st.download_button("📥 Download Plot", buf.getvalue(), file_name=filename, mime="image/png")
\ No newline at end of file
+            st.download_button("📥 Download Plot", png, file_name=file_name, mime="image/png")
@@ -0,0 +1,50 @@
+import streamlit as st
+import numpy as np
+
+PAGE_SIZES = [25, 50, 100, 500]
+
+
+#===== Paged row viewer ======
+def show_rows(df, rows, key, columns=None):
+    """Show the rows of df selected by ``rows`` (boolean mask or positions) one page at a time.
+
+    Search and sort run here on the selected rows, one column at a time;
+    only the current page is sent to the browser.
+    """
+    positions = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows, dtype='int64')
+    view = df if columns is None else df[columns]
+    if not len(positions):
+        st.info("ℹ️ No rows to show.")
+        return
+
+    c1, c2, c3 = st.columns([2, 1, 1])
+    query = c1.text_input("🔎 Search", key=f"{key}_search")
+    search_col = c2.selectbox("In column", ['All columns'] + list(view.columns), key=f"{key}_search_col")
+    sort_col = c3.selectbox("Sort by", ['Row order'] + list(view.columns), key=f"{key}_sort")
+
+    if query:
+        positions = positions[_matches(view, positions, query, search_col)]
+    if sort_col != 'Row order':
+        descending = st.toggle("Descending", key=f"{key}_desc")
+        values = view[sort_col].iloc[positions]
+        order = np.argsort(values.rank(method='first', na_option='bottom', ascending=not descending).to_numpy())
+        positions = positions[order]
+
+    p1, p2 = st.columns([1, 3])
+    page_size = p1.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    pages = max(1, -(-len(positions) // page_size))
+    # the key changes with the page count, so a new search starts at page 1
+    page = p2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page_{pages}")
+    start = (page - 1) * page_size
+    st.caption(f"Rows {min(start + 1, len(positions))}–{min(start + page_size, len(positions))} of {len(positions)}")
+    st.dataframe(view.iloc[positions[start:start + page_size]])
+
+
+def _matches(view, positions, query, column):
+    """Boolean array over ``positions``: rows whose text contains ``query`` (case-insensitive)."""
+    columns = view.columns if column == 'All columns' else [column]
+    found = np.zeros(len(positions), dtype=bool)
+    for col in columns:
+        text = view[col].iloc[positions].astype('string')
+        found |= text.str.contains(query, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+    return found
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.row_index import RowHashIndex
+
+FRAMES = {
+    'signed zeros': pd.DataFrame({'a': [0.0, -0.0, 1.0, 1.0]}),
+    'missing values': pd.DataFrame({'a': [1.0, np.nan, np.nan, 2.0], 'b': ['x', None, None, 'x']}),
+    'nullable and text': pd.DataFrame({'a': pd.array([1, None, 1, 2], dtype='Int64'),
+                                       'b': pd.array(['u', 'v', 'u', 'v'], dtype='string')}),
+    'categorical': pd.DataFrame({'a': pd.Categorical(['p', 'q', 'p', 'p']), 'b': [3, 4, 3, 5]}),
+}
+
+
+@pytest.mark.parametrize('name', FRAMES)
+@pytest.mark.parametrize('subset', [None, ['a']])
+def test_duplicated_matches_pandas(name, subset):
+    df = FRAMES[name]
+    expected = df.duplicated(subset=subset).to_numpy()
+    np.testing.assert_array_equal(RowHashIndex(df).duplicated(subset), expected)
+
+
+def test_index_after_row_drop_matches_rebuilt():
+    df = FRAMES['signed zeros']
+    index = RowHashIndex(df)
+    dropped = index.duplicated()
+    kept = df[~dropped]
+    carried = index.after_row_drop(kept, dropped)
+    np.testing.assert_array_equal(carried.duplicated(), RowHashIndex(kept).duplicated())
+    assert len(carried.row_keys()) == len(kept)